@@ -8,52 +8,148 @@ Last updated: 2025-07-12 18:59:00
 Client for interacting with IPTV service APIs
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import time
 import logging
+import threading
+from bisect import bisect_right
+from itertools import accumulate
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from urllib.parse import urljoin
 
+try:
+    import orjson  # Optional, much faster decoding of large catalogs
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # Optional, lets searches stream-parse large catalogs
+except ImportError:
+    ijson = None
+
+try:
+    # urllib3 can only decode Brotli responses when one of these is installed
+    try:
+        import brotli
+    except ImportError:
+        import brotlicffi as brotli
+except ImportError:
+    brotli = None
+
+from chumpstreams_config import VERSION
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+def _json(response):
+    """Decode a JSON response body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+# Catalog fields whose values repeat across most items
+_SHARED_VALUE_FIELDS = ('stream_type', 'category_id', 'container_extension', 'rating', 'rating_5based')
+
+def _share_repeated_values(items):
+    """
+    Make catalog items share one object per repeated field value
+    
+    Both JSON decoders already reuse the key strings, but every value is a
+    fresh object, so a large catalog holds many copies of values like
+    "live" or "mp4". Pointing equal values at one instance frees the rest.
+    """
+    shared = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        for field in _SHARED_VALUE_FIELDS:
+            value = item.get(field)
+            if type(value) is str:
+                item[field] = shared.setdefault(value, value)
+
+class TokenBucket:
+    """Token bucket rate limiter that allows short bursts of requests"""
+    
+    def __init__(self, capacity, refill_rate):
+        """
+        Initialize the token bucket
+        
+        Args:
+            capacity: Maximum number of tokens, i.e. the largest burst allowed
+            refill_rate: Tokens added per second, i.e. the sustained request rate
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, cost=1):
+        """Take tokens from the bucket, sleeping until they are available"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+            self.last_refill = now
+            
+            # Reserve the tokens straight away so concurrent callers queue up
+            # behind this one instead of all waking at the same time
+            self.tokens -= cost
+            wait_time = -self.tokens / self.refill_rate if self.tokens < 0 else 0
+        
+        if wait_time > 0:
+            time.sleep(wait_time)
+
 class ApiClient:
     """Client for interacting with the IPTV API"""
     
     def __init__(self, base_url, use_https=True, username='', password=''):
         """Initialize API client"""
-        # First, fix any double protocols in the base URL
-        if base_url.startswith('https://http://'):
-            base_url = base_url.replace('https://', '', 1)
-            use_https = False  # Force HTTP since the URL already specifies it
-        elif base_url.startswith('http://https://'):
-            base_url = base_url.replace('http://', '', 1)
-            use_https = True  # Force HTTPS since the URL already specifies it
-        
-        # Check if base_url already has a protocol
-        if base_url.startswith('http://') or base_url.startswith('https://'):
-            # Keep existing protocol
-            self.base_url = base_url
-            
-            # Add port if not already specified
-            if not any(f":{port}" in self.base_url for port in ['80', '443', '8080']):
-                if base_url.startswith('https://'):
-                    self.base_url += ':443'
-                else:
-                    self.base_url += ':80'
-        else:
-            # No protocol in URL, add it
-            protocol = 'https' if use_https else 'http'
-            port = '443' if use_https else '80'
-            self.base_url = f"{protocol}://{base_url}:{port}"
+        self.set_base_url(base_url, use_https)
         
         self.username = username
         self.password = password
         self.token = None
         self.user_info = {}
         self.logged_in = False
-        self.last_request_time = 0
-        self.request_delay = 0.5  # Delay between requests in seconds
+        # Allow bursts of up to 10 requests, then a sustained 2 requests per second
+        self._bucket = TokenBucket(capacity=10, refill_rate=2.0)
+        self.request_timeout = (3.05, 15)  # (connect, read) timeouts in seconds
+        
+        # Use a persistent session so requests to the service reuse pooled
+        # keep-alive connections instead of a new TCP/TLS handshake each time
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        
+        # Catalog listings are large, repetitive JSON, so ask for them
+        # compressed. Brotli is only advertised when it can be decoded.
+        self._session.headers.update({
+            'Accept-Encoding': 'br, gzip, deflate' if brotli is not None else 'gzip, deflate',
+            'User-Agent': f'ChumpStreams/{VERSION}',
+            'Connection': 'keep-alive'
+        })
+        self._encoding_logged = False
+        
+        # Short-lived cache of API responses, keyed by request
+        self._cache = {}  # (url, params) -> (timestamp, data)
+        self._cache_lock = threading.Lock()
+        self.cache_duration = 300  # Cache responses for 5 minutes
+        self.cache_max_entries = 32
+        self._search_index = {}  # content type -> (streams, (search_blob, offsets))
+        self._server_search_supported = {}  # content type -> bool, once probed
+        self._catalog_actions = {
+            'live': 'get_live_streams',
+            'vod': 'get_vod_streams',
+            'series': 'get_series'
+        }
     
     def set_base_url(self, url, use_https=True):
         """Set the base URL safely without adding duplicate protocols"""
@@ -81,6 +177,16 @@ class ApiClient:
             protocol = 'https' if use_https else 'http'
             port = '443' if use_https else '80'
             self.base_url = f"{protocol}://{url}:{port}"
+        
+        if getattr(self, 'logged_in', False):
+            self._build_stream_prefixes()
+    
+    def _build_stream_prefixes(self):
+        """Build the fixed part of stream URLs once per session"""
+        credentials = f"{self.username}/{self.password}/"
+        self._live_prefix = f"{self.base_url}/live/{credentials}"
+        self._vod_prefix = f"{self.base_url}/movie/{credentials}"
+        self._series_prefix = f"{self.base_url}/series/{credentials}"
     
     def login(self, username=None, password=None):
         """Login to the IPTV service"""
@@ -104,13 +210,16 @@ class ApiClient:
         
         try:
             self._wait_for_rate_limit()
-            response = requests.get(url, params=params)
-            data = response.json()
+            response = self._session.get(url, params=params, timeout=self.request_timeout)
+            data = _json(response)
             
             if 'user_info' in data:
                 self.user_info = data['user_info']
                 self.token = self.user_info.get('auth', None)
                 self.logged_in = True
+                self.invalidate_cache()
+                self._server_search_supported = {}
+                self._build_stream_prefixes()
                 logger.info(f"Login successful for user: {self.username}")
                 return data
             else:
@@ -125,9 +234,21 @@ class ApiClient:
         self.token = None
         self.user_info = {}
         self.logged_in = False
+        self._live_prefix = self._vod_prefix = self._series_prefix = None
+        self.invalidate_cache()
+        self.close()
         logger.info(f"Logged out user: {self.username}")
         return True
     
+    @property
+    def session(self):
+        """The pooled HTTP session, for other clients of the same service to share"""
+        return self._session
+    
+    def close(self):
+        """Close pooled connections held by the HTTP session"""
+        self._session.close()
+    
     def get_categories(self, content_type):
         """Get categories for a content type"""
         if not self.logged_in:
@@ -151,9 +272,7 @@ class ApiClient:
         }
         
         try:
-            self._wait_for_rate_limit()
-            response = requests.get(url, params=params)
-            return response.json()
+            return self._cached_get(url, params)
         except Exception as e:
             logger.error(f"Failed to get categories for {content_type}: {str(e)}")
             return []
@@ -171,7 +290,33 @@ class ApiClient:
         """Get series categories"""
         return self.get_categories('series')
     
-    def get_live_streams(self, category_id=None):
+    def get_all_categories(self):
+        """
+        Get the categories of every content type at once
+        
+        The three requests are independent, so they are made concurrently
+        and the wait is roughly that of the slowest one. Each response is
+        cached under its own entry, as with get_categories.
+        
+        Returns:
+            dict: Category lists keyed by content type ('live', 'vod', 'series')
+        """
+        content_types = ['live', 'vod', 'series']
+        with ThreadPoolExecutor(max_workers=len(content_types)) as executor:
+            futures = {ctype: executor.submit(self.get_categories, ctype) for ctype in content_types}
+        
+        # Collect each type separately so one failure doesn't lose the others
+        categories = {}
+        for ctype in content_types:
+            try:
+                categories[ctype] = futures[ctype].result()
+            except Exception as e:
+                logger.error(f"Failed to get categories for {ctype}: {str(e)}")
+                categories[ctype] = []
+        
+        return categories
+    
+    def get_live_streams(self, category_id=None, filter_query=None):
         """Get live TV streams"""
         if not self.logged_in:
             return []
@@ -186,15 +331,18 @@ class ApiClient:
         if category_id:
             params['category_id'] = category_id
         
+        if filter_query:
+            # Ask the server to filter by name, on servers that support it
+            params['search'] = filter_query
+        
         try:
-            self._wait_for_rate_limit()
-            response = requests.get(url, params=params)
-            return response.json()
+            # Filtered listings are one-off results, keep them out of the cache
+            return self._cached_get(url, params, cache=not filter_query)
         except Exception as e:
             logger.error(f"Failed to get live streams: {str(e)}")
             return []
     
-    def get_vod_streams(self, category_id=None):
+    def get_vod_streams(self, category_id=None, filter_query=None):
         """Get video on demand streams"""
         if not self.logged_in:
             return []
@@ -209,15 +357,18 @@ class ApiClient:
         if category_id:
             params['category_id'] = category_id
         
+        if filter_query:
+            # Ask the server to filter by name, on servers that support it
+            params['search'] = filter_query
+        
         try:
-            self._wait_for_rate_limit()
-            response = requests.get(url, params=params)
-            return response.json()
+            # Filtered listings are one-off results, keep them out of the cache
+            return self._cached_get(url, params, cache=not filter_query)
         except Exception as e:
             logger.error(f"Failed to get VOD streams: {str(e)}")
             return []
     
-    def get_series(self, category_id=None):
+    def get_series(self, category_id=None, filter_query=None):
         """Get TV series"""
         if not self.logged_in:
             return []
@@ -232,10 +383,13 @@ class ApiClient:
         if category_id:
             params['category_id'] = category_id
         
+        if filter_query:
+            # Ask the server to filter by name, on servers that support it
+            params['search'] = filter_query
+        
         try:
-            self._wait_for_rate_limit()
-            response = requests.get(url, params=params)
-            return response.json()
+            # Filtered listings are one-off results, keep them out of the cache
+            return self._cached_get(url, params, cache=not filter_query)
         except Exception as e:
             logger.error(f"Failed to get series: {str(e)}")
             return []
@@ -254,9 +408,9 @@ class ApiClient:
         }
         
         try:
-            self._wait_for_rate_limit()
-            response = requests.get(url, params=params)
-            return response.json()
+            # The content manager caches processed info itself, and processing
+            # changes the response in place, so it mustn't be shared from here
+            return self._cached_get(url, params, cache=False)
         except Exception as e:
             logger.error(f"Failed to get series info for ID {series_id}: {str(e)}")
             return None
@@ -275,9 +429,9 @@ class ApiClient:
         }
         
         try:
-            self._wait_for_rate_limit()
-            response = requests.get(url, params=params)
-            return response.json()
+            # The content manager caches processed info itself, and processing
+            # changes the response in place, so it mustn't be shared from here
+            return self._cached_get(url, params, cache=False)
         except Exception as e:
             logger.error(f"Failed to get VOD info for ID {vod_id}: {str(e)}")
             return None
@@ -287,7 +441,7 @@ class ApiClient:
         if not self.logged_in:
             return None
         
-        return f"{self.base_url}/live/{self.username}/{self.password}/{stream_id}.ts"
+        return f"{self._live_prefix}{stream_id}.ts"
     
     def get_vod_stream_url(self, stream_id, extension=None):
         """Get URL for a VOD stream"""
@@ -296,7 +450,7 @@ class ApiClient:
         
         # Use the provided extension or default to mp4
         ext = extension or "mp4"
-        return f"{self.base_url}/movie/{self.username}/{self.password}/{stream_id}.{ext}"
+        return f"{self._vod_prefix}{stream_id}.{ext}"
     
     def get_series_stream_url(self, stream_id, extension=None):
         """Get URL for a series episode"""
@@ -305,7 +459,7 @@ class ApiClient:
         
         # Use the provided extension or default to mp4
         ext = extension or "mp4"
-        return f"{self.base_url}/series/{self.username}/{self.password}/{stream_id}.{ext}"
+        return f"{self._series_prefix}{stream_id}.{ext}"
     
     def search(self, query, content_type=None):
         """Search for content by name with enhanced logging"""
@@ -323,49 +477,42 @@ class ApiClient:
         else:
             content_types = [content_type]
         
+        fetchers = {
+            'live': self.get_live_streams,
+            'vod': self.get_vod_streams,
+            'series': self.get_series
+        }
+        content_types = [ctype for ctype in content_types if ctype in fetchers]
+        if not content_types:
+            return []
+        
+        # Fetch the catalogs concurrently - the requests are independent and
+        # network bound, so the wait is roughly the slowest single fetch
+        with ThreadPoolExecutor(max_workers=len(content_types)) as executor:
+            futures = {
+                ctype: executor.submit(self._fetch_search_candidates, ctype, fetchers[ctype], query)
+                for ctype in content_types
+            }
+        
         for ctype in content_types:
             try:
                 logger.info(f"Searching {ctype} content...")
+                streams = futures[ctype].result()
+                logger.info(f"Retrieved {len(streams) if streams else 0} {ctype} streams")
                 
-                if ctype == 'live':
-                    streams = self.get_live_streams()
-                    logger.info(f"Retrieved {len(streams) if streams else 0} live streams")
-                    
-                    if streams:
-                        for stream in streams:
-                            name = stream.get('name', '').lower()
-                            if query in name:
-                                stream['content_type'] = 'live'
-                                results.append(stream)
-                                logger.debug(f"Found match: {stream.get('name')}")
+                if not streams:
+                    continue
                 
-                elif ctype == 'vod':
-                    streams = self.get_vod_streams()
-                    logger.info(f"Retrieved {len(streams) if streams else 0} VOD streams")
-                    
-                    if streams:
-                        for stream in streams:
-                            # Search in both name and title fields
-                            name = stream.get('name', '').lower()
-                            title = stream.get('title', '').lower()
-                            if query in name or query in title:
-                                stream['content_type'] = 'vod'
-                                results.append(stream)
-                                logger.debug(f"Found match: {stream.get('name') or stream.get('title')}")
+                search_blob, offsets = self._get_search_index(ctype, streams)
+                matches = [streams[index] for index in self._find_matches(search_blob, offsets, query)]
+                for stream in matches:
+                    stream['content_type'] = ctype
+                results.extend(matches)
                 
-                elif ctype == 'series':
-                    series_list = self.get_series()
-                    logger.info(f"Retrieved {len(series_list) if series_list else 0} series")
-                    
-                    if series_list:
-                        for series in series_list:
-                            # Search in both name and title fields
-                            name = series.get('name', '').lower()
-                            title = series.get('title', '').lower()
-                            if query in name or query in title:
-                                series['content_type'] = 'series'
-                                results.append(series)
-                                logger.debug(f"Found match: {series.get('name') or series.get('title')}")
+                # Only format the per-match messages when they will be shown
+                if logger.isEnabledFor(logging.DEBUG):
+                    for stream in matches:
+                        logger.debug(f"Found match: {stream.get('name') or stream.get('title')}")
                         
             except Exception as e:
                 logger.error(f"Error searching {ctype}: {str(e)}", exc_info=True)
@@ -373,13 +520,192 @@ class ApiClient:
         logger.info(f"Search for '{query}' completed with {len(results)} total results")
         return results
     
-    def _wait_for_rate_limit(self):
-        """Ensure we don't exceed rate limits"""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
+    def _fetch_search_candidates(self, ctype, fetch, query):
+        """
+        Fetch the catalog items of one content type that may match a query
+        
+        Some servers filter listings by name when given a search parameter,
+        which avoids downloading and decoding the whole catalog. Support is
+        probed once per content type: the filtered listing must be smaller
+        than the full one and give the same local matches. A query with no
+        local matches can't tell the two apart, so the probe is repeated on
+        the next search. Results are always filtered locally afterwards, so
+        unsupported servers still work.
+        """
+        supported = self._server_search_supported.get(ctype)
+        if supported is False:
+            matches = self._stream_search(ctype, query)
+            return matches if matches is not None else fetch()
+        
+        filtered = fetch(filter_query=query)
+        if supported is None:
+            full = fetch()
+            if not isinstance(full, list):
+                return full
+            
+            full_matches = self._count_matches(ctype, full, query)
+            if not full_matches:
+                # Nothing to compare against, decide on a later search
+                return full
+            
+            supported = (
+                isinstance(filtered, list)
+                and len(filtered) < len(full)
+                and self._count_matches(ctype, filtered, query) == full_matches
+            )
+            self._server_search_supported[ctype] = supported
+            logger.info(f"Server-side {ctype} search supported: {supported}")
+            
+            if not supported:
+                return full
+        
+        return filtered
+    
+    def _stream_search(self, ctype, query):
+        """
+        Stream-parse a catalog, keeping only the items that match query
+        
+        Only the matches are held in memory rather than the whole decoded
+        catalog. Returns None when ijson is not installed or the catalog is
+        already cached, in which case the full listing should be used.
+        """
+        if ijson is None:
+            return None
         
-        if time_since_last_request < self.request_delay:
-            sleep_time = self.request_delay - time_since_last_request
-            time.sleep(sleep_time)
+        url = f"{self.base_url}/player_api.php"
+        params = {
+            'username': self.username,
+            'password': self.password,
+            'action': self._catalog_actions[ctype]
+        }
+        if self._is_cached(url, params):
+            return None
+        
+        self._wait_for_rate_limit()
+        matches = []
+        with self._session.get(url, params=params, timeout=self.request_timeout, stream=True) as response:
+            response.raw.decode_content = True  # Let urllib3 undo any compression
+            for stream in ijson.items(response.raw, 'item', use_float=True):
+                if query in self._search_text(ctype, stream).lower():
+                    matches.append(stream)
         
-        self.last_request_time = time.time()
\ No newline at end of file
+        logger.debug(f"Streamed {ctype} catalog for '{query}', kept {len(matches)} matches")
+        return matches
+    
+    def _count_matches(self, ctype, streams, query):
+        """Count the catalog items whose search text contains query"""
+        search_blob, offsets = self._get_search_index(ctype, streams)
+        return sum(1 for _ in self._find_matches(search_blob, offsets, query))
+    
+    def _get_search_index(self, ctype, streams):
+        """
+        Get the search index for a catalog
+        
+        The lowercased search texts of all items are joined into one string,
+        so a query is located with C-level str.find scans over the whole
+        catalog instead of a Python-level test per item. The index is built
+        once per fetched catalog list and reused until the list is refetched.
+        
+        Returns:
+            tuple: (search_blob, offsets) where offsets[i] is the position
+            of item i's text in search_blob
+        """
+        with self._cache_lock:
+            entry = self._search_index.get(ctype)
+            if entry and entry[0] is streams:
+                return entry[1]
+        
+        search_texts = [self._search_text(ctype, stream) for stream in streams]
+        
+        # Lowercase the joined text in one call rather than item by item.
+        # A few characters change length when lowercased, which would shift
+        # the offsets, so fall back to per-item lowering if that happens.
+        search_blob = '\n'.join(search_texts)
+        lowered_blob = search_blob.lower()
+        if len(lowered_blob) != len(search_blob):
+            search_texts = [text.lower() for text in search_texts]
+            lowered_blob = '\n'.join(search_texts)
+        
+        # Each text is followed by a newline separator
+        offsets = list(accumulate((len(text) + 1 for text in search_texts), initial=0))[:-1]
+        
+        index = (lowered_blob, offsets)
+        
+        with self._cache_lock:
+            self._search_index[ctype] = (streams, index)
+        
+        return index
+    
+    @staticmethod
+    def _search_text(ctype, stream):
+        """Get the text a catalog item is searched on, before lowercasing"""
+        if ctype == 'live':
+            # Live channels are only matched on their name
+            return stream.get('name') or ''
+        
+        # VOD and series can be matched on both name and title
+        return f"{stream.get('name') or ''}\n{stream.get('title') or ''}"
+    
+    def _find_matches(self, search_blob, offsets, query):
+        """Yield the indexes of catalog items whose search text contains query"""
+        # Bind the lookups used on every match to locals
+        find = search_blob.find
+        last_index = len(offsets) - 1
+        
+        position = find(query)
+        while position != -1:
+            index = bisect_right(offsets, position) - 1
+            yield index
+            
+            # Continue from the next item so each item is only reported once
+            if index >= last_index:
+                break
+            position = find(query, offsets[index + 1])
+    
+    def _is_cached(self, url, params):
+        """Check whether a fresh response for a request is cached"""
+        cache_key = (url, tuple(sorted(params.items())))
+        
+        with self._cache_lock:
+            entry = self._cache.get(cache_key)
+            return bool(entry) and time.time() - entry[0] < self.cache_duration
+    
+    def _cached_get(self, url, params, cache=True):
+        """GET a JSON API response, serving repeated requests from the cache"""
+        cache_key = (url, tuple(sorted(params.items())))
+        
+        with self._cache_lock:
+            entry = self._cache.get(cache_key)
+            if entry and time.time() - entry[0] < self.cache_duration:
+                return entry[1]
+        
+        self._wait_for_rate_limit()
+        response = self._session.get(url, params=params, timeout=self.request_timeout)
+        if not self._encoding_logged:
+            self._encoding_logged = True
+            logger.debug(f"API response Content-Encoding: {response.headers.get('Content-Encoding', 'none')}")
+        data = _json(response)
+        if isinstance(data, list):
+            _share_repeated_values(data)
+        
+        if not cache:
+            return data
+        
+        with self._cache_lock:
+            if cache_key not in self._cache and len(self._cache) >= self.cache_max_entries:
+                # Evict the oldest entry to keep the cache bounded
+                oldest_key = min(self._cache, key=lambda key: self._cache[key][0])
+                del self._cache[oldest_key]
+            self._cache[cache_key] = (time.time(), data)
+        
+        return data
+    
+    def invalidate_cache(self):
+        """Drop all cached API responses"""
+        with self._cache_lock:
+            self._cache.clear()
+            self._search_index.clear()
+    
+    def _wait_for_rate_limit(self):
+        """Ensure we don't exceed rate limits"""
+        self._bucket.acquire(1)
\ No newline at end of file
@@ -10,9 +10,9 @@ Main entry point for ChumpStreams application
 import sys
 import os
 import logging
+import threading
 import traceback
 from PyQt5.QtWidgets import QApplication, QMessageBox
-from PyQt5.QtCore import QTimer  # QTimer is in QtCore, not QtWidgets
 
 # Setup logging
 from chumpstreams_config import LOG_FILE, VERSION
@@ -21,43 +21,60 @@ from chumpstreams_logging import setup_logging
 logger = setup_logging(LOG_FILE)
 logger.info("Starting ChumpStreams application")
 
-# Import components
-try:
-    from chumpstreams_app import ChumpStreamsApp
-    from chumpstreams_player import QtVlcPlayer
-    from chumpstreams_splash import show_splash_screen
-    from chumpstreams_patches import patch_login_dialog
-    from chumpstreams_ui import ChumpStreamsMainWindow
-    from chumpstreams_login_dialog import show_login_dialog
-    logger.info("Successfully imported all modules")
-except Exception as e:
-    logger.critical(f"Failed to import modules: {str(e)}")
-    logger.critical(traceback.format_exc())
-    raise
-
-# Apply patches
-patch_login_dialog(ChumpStreamsMainWindow, show_login_dialog)
-
-def main():
-    """Application entry point"""
-    logger.info("Starting main application function")
+def import_components():
+    """
+    Import the application modules
+    
+    The application graph is slow to import, so this runs after the splash
+    screen is visible rather than at module load.
+    """
+    try:
+        from chumpstreams_app import ChumpStreamsApp
+        from chumpstreams_patches import patch_login_dialog
+        from chumpstreams_ui import ChumpStreamsMainWindow
+        from chumpstreams_login_dialog import show_login_dialog
+        logger.info("Successfully imported all modules")
+    except Exception as e:
+        logger.critical(f"Failed to import modules: {str(e)}")
+        logger.critical(traceback.format_exc())
+        raise
+    
+    # Apply patches
+    patch_login_dialog(ChumpStreamsMainWindow, show_login_dialog)
     
-    # Kill any existing VLC processes
+    return ChumpStreamsApp
+
+def kill_existing_vlc():
+    """Kill any VLC processes left over from a previous run"""
     try:
+        from chumpstreams_player import QtVlcPlayer
         player = QtVlcPlayer()
         player.kill_all_vlc_processes()
     except Exception as e:
         logger.error(f"Failed to kill existing VLC processes: {str(e)}")
-        
+
+def main():
+    """Application entry point"""
+    logger.info("Starting main application function")
+    
     # Create QApplication
     app = QApplication(sys.argv)
     app.setApplicationName("ChumpStreams")
     app.setApplicationVersion(VERSION)
     logger.info("QApplication created")
     
+    # Kill any existing VLC processes in the background, so scanning the
+    # process list doesn't hold up the splash screen
+    threading.Thread(target=kill_existing_vlc, daemon=True).start()
+    
     try:
         # Show splash screen first
+        from chumpstreams_splash import show_splash_screen
         splash = show_splash_screen(app, 10000)  # Show for 10 seconds
+        app.processEvents()
+        
+        # Import the rest of the application while the splash is painted
+        ChumpStreamsApp = import_components()
         
         # Create and run the application while splash is showing
         chumpstreams = ChumpStreamsApp(app)
@@ -68,18 +85,14 @@ def main():
                 chumpstreams.window.show()
                 logger.info("Main window displayed")
         
-        # Use timer to check if splash is still visible
-        def check_splash():
-            if splash.isVisible():
-                QTimer.singleShot(100, check_splash)
-            else:
-                show_main_window()
-        
-        # Start checking
-        QTimer.singleShot(100, check_splash)
+        # Show the main window as soon as the splash goes away
+        splash.finished.connect(show_main_window)
+        if not splash.isVisible():
+            show_main_window()
         
         # Handle application close
         app.aboutToQuit.connect(lambda: chumpstreams.player.close(force=True))
+        app.aboutToQuit.connect(chumpstreams.favorites_manager.flush_pending_save)
         
         logger.info("Entering Qt event loop")
         return app.exec_()
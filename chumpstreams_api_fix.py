@@ -7,17 +7,33 @@ Created: 2025-07-12 17:18:34
 
 Comprehensive fix for URL handling in API calls
 """
+import functools
 import logging
-import re
-import inspect
-import types
 
 logger = logging.getLogger('chumpstreams')
 
+# Marks a missing attribute in getattr probes
+_MISSING = object()
+
+# Doubled protocol prefixes, mapped to the length of the outer protocol
+_DOUBLE_PROTOCOLS = {
+    'https://http://': len('https://'),
+    'http://https://': len('http://')
+}
+
+def _fix_double_protocol(url):
+    """Drop the outer protocol from a URL like https://http://host, or return None"""
+    outer = _DOUBLE_PROTOCOLS.get(url[:15].lower())
+    return url[outer:] if outer else None
+
+@functools.lru_cache(maxsize=256)
 def normalize_url(url, use_https=True):
     """
     Normalize a URL to ensure it has the correct protocol and format
     
+    Results are memoized, as the same few service URLs are normalized for
+    every request, so the debug messages only appear the first time.
+    
     Args:
         url: The URL string to normalize
         use_https: Whether to use HTTPS protocol if none exists
@@ -25,32 +41,81 @@ def normalize_url(url, use_https=True):
     Returns:
         str: Properly formatted URL
     """
-    # Strip whitespace
-    url = url.strip()
+    # Strip whitespace, which most URLs don't have
+    if url and (url[0].isspace() or url[-1].isspace()):
+        url = url.strip()
+    
+    # Strip any trailing slashes
+    if url.endswith('/'):
+        url = url.rstrip('/')
     
     # Check if URL already has protocol
-    has_protocol = bool(re.match(r'^https?://', url))
+    lower = url[:8].lower()
+    has_protocol = lower.startswith('http://') or lower.startswith('https://')
     
     if has_protocol:
         # URL already has protocol, don't add another
-        # Extract the protocol from the URL
-        protocol = url.split('://', 1)[0].lower()
-        logger.debug(f"URL already has protocol: {protocol}://, keeping it")
-        
-        # Strip any trailing slashes
-        clean_url = url.rstrip('/')
-        return clean_url
+        if logger.isEnabledFor(logging.DEBUG):
+            # Index 4 is 's' for https and ':' for http
+            protocol = 'https' if url[4] in 'sS' else 'http'
+            logger.debug("URL already has protocol: %s://, keeping it", protocol)
+        return url
     else:
         # No protocol in URL, add it
         protocol = "https" if use_https else "http"
-        clean_url = f"{protocol}://{url.rstrip('/')}"
-        logger.debug(f"Added protocol {protocol}:// to URL")
-        return clean_url
+        logger.debug("Added protocol %s:// to URL", protocol)
+        return f"{protocol}://{url}"
+
+def _patched_set_service(self, service):
+    """Patched method to set service with proper URL handling"""
+    # Make sure URL is properly normalized
+    original_url = service.get('url')
+    if original_url is not None:
+        normalized = normalize_url(original_url, service.get('use_https', True))
+        
+        # Copy the service dict with the new URL so we don't modify the original
+        service_copy = {**service, 'url': normalized}
+        
+        # Log the change
+        if original_url != normalized:
+            logger.info("Normalized service URL from '%s' to '%s'", original_url, normalized)
+        else:
+            logger.info("Using service URL as is: '%s'", normalized)
+    else:
+        # Nothing to normalize, so there is no need for a copy
+        service_copy = service
+    
+    # Call original method with normalized service
+    return self._orig_set_service(service_copy)
+
+def _patched_build_url(self, endpoint, use_https=True):
+    """Patched method to build URLs with proper handling"""
+    # Normalizing the base URL is only redone when it changes, as base_url
+    # is reassigned directly on service switches. Both attributes are
+    # guaranteed to exist once the patch is installed.
+    key = (self.base_url, use_https)
+    cached = self._base_url_slash
+    if cached is None or cached[0] != key:
+        cached = (key, normalize_url(self.base_url, use_https) + '/')
+        self._base_url_slash = cached
+    base_url_slash = cached[1]
+    
+    # Handle endpoint, collapsing any leading slashes so the join has exactly one
+    endpoint = endpoint.lstrip('/')
+    
+    # Combine and return
+    full_url = base_url_slash + endpoint
+    logger.debug("Built full URL: %s", full_url)
+    return full_url
 
 def patch_api_class(api_obj):
     """
     Patch the API class with proper URL handling
     
+    The patched methods are defined on a subclass of the API object's class
+    and the object is switched over to it, so calls use normal method lookup
+    instead of per-instance bound methods.
+    
     Args:
         api_obj: The API instance to patch
     
@@ -58,80 +123,50 @@ def patch_api_class(api_obj):
         bool: True if patch was successful
     """
     try:
-        # Store original methods before patching
-        original_methods = {}
+        # Patching again would stack another subclass on top of this one
+        if getattr(api_obj, '_chump_patched', False):
+            logger.debug("API methods already patched for URL handling")
+            return True
         
-        # Patch set_service method
-        if hasattr(api_obj, 'set_service'):
-            original_methods['set_service'] = api_obj.set_service
-            
-            def patched_set_service(self, service):
-                """Patched method to set service with proper URL handling"""
-                # Make a copy of the service dict so we don't modify the original
-                service_copy = service.copy()
-                
-                # Make sure URL is properly normalized
-                if 'url' in service_copy:
-                    original_url = service_copy['url']
-                    use_https = service_copy.get('use_https', True)
-                    service_copy['url'] = normalize_url(original_url, use_https)
-                    
-                    # Log the change
-                    if original_url != service_copy['url']:
-                        logger.info(f"Normalized service URL from '{original_url}' to '{service_copy['url']}'")
-                    else:
-                        logger.info(f"Using service URL as is: '{service_copy['url']}'")
-                
-                # Call original method with normalized service
-                return original_methods['set_service'](self, service_copy)
-            
-            # Bind the patched method to the object
-            api_obj.set_service = types.MethodType(patched_set_service, api_obj)
+        cls = type(api_obj)
+        namespace = {
+            # Add a utility method for URL normalization
+            'normalize_url': staticmethod(normalize_url),
+            '_chump_patched': True
+        }
+        
+        # Patch set_service method, keeping the original for the patched one to call
+        original = getattr(cls, 'set_service', _MISSING)
+        if original is not _MISSING:
+            namespace['_orig_set_service'] = original
+            namespace['set_service'] = _patched_set_service
         
         # Patch _build_url method
-        if hasattr(api_obj, '_build_url'):
-            original_methods['_build_url'] = api_obj._build_url
+        original = getattr(cls, '_build_url', _MISSING)
+        if original is not _MISSING:
+            namespace['_orig_build_url'] = original
+            namespace['_build_url'] = _patched_build_url
             
-            def patched_build_url(self, endpoint, use_https=True):
-                """Patched method to build URLs with proper handling"""
-                # Get base URL
-                base_url = self.base_url if hasattr(self, 'base_url') else ""
-                
-                # Normalize the base URL first
-                base_url = normalize_url(base_url, use_https)
-                logger.debug(f"Building URL with normalized base: {base_url}")
-                
-                # Handle endpoint
-                if endpoint.startswith('/'):
-                    endpoint = endpoint[1:]
-                
-                # Combine and return
-                full_url = f"{base_url}/{endpoint}"
-                logger.debug(f"Built full URL: {full_url}")
-                return full_url
-            
-            # Bind the patched method to the object
-            api_obj._build_url = types.MethodType(patched_build_url, api_obj)
+            # Defaults so the patched method needs no per-call attribute checks
+            namespace['_base_url_slash'] = None  # ((base_url, use_https), normalized base URL + '/')
+            if getattr(api_obj, 'base_url', _MISSING) is _MISSING:
+                api_obj.base_url = ''
+        
+        api_obj.__class__ = type('Patched' + cls.__name__, (cls,), namespace)
         
         # Also directly fix the base_url if it already has a bad format
-        if hasattr(api_obj, 'base_url'):
-            original_url = api_obj.base_url
-            if original_url.startswith('https://http://') or original_url.startswith('http://https://'):
-                # Fix the double protocol
-                fixed_url = re.sub(r'^https?://(https?://)', r'\1', original_url)
+        original_url = getattr(api_obj, 'base_url', _MISSING)
+        if original_url is not _MISSING:
+            fixed_url = _fix_double_protocol(original_url)
+            if fixed_url is not None:
                 api_obj.base_url = fixed_url
-                logger.info(f"Fixed double protocol in base_url: {original_url} -> {fixed_url}")
-        
-        # Add a utility method for URL normalization
-        api_obj.normalize_url = types.MethodType(normalize_url, api_obj)
+                logger.info("Fixed double protocol in base_url: %s -> %s", original_url, fixed_url)
         
         logger.info("Successfully patched API methods for proper URL handling")
         return True
     
     except Exception as e:
-        logger.error(f"Error patching API class: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception("Error patching API class: %s", e)
         return False
 
 def apply_api_patches(app):
@@ -143,36 +178,36 @@ def apply_api_patches(app):
     """
     try:
         # Check if app has api attribute
-        if not hasattr(app, 'api'):
+        api = getattr(app, 'api', _MISSING)
+        if api is _MISSING:
             logger.error("Cannot patch API: app.api not found")
             return False
         
         # Log current state
-        if hasattr(app, 'current_service'):
-            service = app.current_service
-            logger.info(f"Current service before patching: {service.get('name', 'Unknown')} at {service.get('url', 'Unknown URL')}")
+        service = getattr(app, 'current_service', _MISSING)
+        if service is not _MISSING:
+            logger.info("Current service before patching: %s at %s", service.get('name', 'Unknown'), service.get('url', 'Unknown URL'))
         
         # Patch the API class
-        success = patch_api_class(app.api)
+        success = patch_api_class(api)
         
         # If already connected to a service with a bad URL, reconnect
-        if success and hasattr(app, 'current_service') and hasattr(app.api, 'base_url'):
-            current_url = app.api.base_url
-            if current_url.startswith('https://http://') or current_url.startswith('http://https://'):
-                logger.info(f"Detected bad URL format: {current_url}, attempting to reconnect")
+        current_url = getattr(api, 'base_url', _MISSING)
+        if success and service is not _MISSING and current_url is not _MISSING:
+            if _fix_double_protocol(current_url) is not None:
+                logger.info("Detected bad URL format: %s, attempting to reconnect", current_url)
                 
                 # Force reconnect with current service
-                if hasattr(app.api, 'set_service'):
+                set_service = getattr(api, 'set_service', _MISSING)
+                if set_service is not _MISSING:
                     try:
-                        app.api.set_service(app.current_service)
-                        logger.info(f"Reconnected to service with fixed URL: {app.api.base_url}")
+                        set_service(service)
+                        logger.info("Reconnected to service with fixed URL: %s", api.base_url)
                     except Exception as e:
-                        logger.error(f"Error reconnecting to service: {str(e)}")
+                        logger.error("Error reconnecting to service: %s", e)
         
         return success
     
     except Exception as e:
-        logger.error(f"Error applying API patches: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.exception("Error applying API patches: %s", e)
         return False
\ No newline at end of file
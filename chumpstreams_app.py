@@ -10,8 +10,10 @@ Main application controller for ChumpStreams with multi-service support
 import os
 import logging
 import json
-import traceback
-from PyQt5.QtWidgets import QApplication, QMessageBox
+import time
+import hashlib
+import threading
+from PyQt5.QtWidgets import QMessageBox
 from PyQt5.QtCore import Qt, QTimer  # QTimer is in QtCore, not QtWidgets
 
 # Import configuration
@@ -39,6 +41,13 @@ from chumpstreams_patches import enable_favorite_context_menu, disable_all_conte
 
 logger = logging.getLogger('chumpstreams')
 
+# Fields copied from the info API response into movie and series items
+_VOD_INFO_KEYS = frozenset(('plot', 'genre', 'rating', 'duration', 'director', 'cast'))
+_SERIES_INFO_KEYS = frozenset(('plot', 'genre', 'rating', 'cast', 'director'))
+
+# Prefixes showing the content type of each search result
+_SEARCH_RESULT_PREFIXES = {'live': "[Live] ", 'vod': "[Movie] ", 'series': "[Series] "}
+
 class ChumpStreamsApp:
     """Main application controller"""
     
@@ -78,7 +87,7 @@ class ChumpStreamsApp:
         self.settings_manager = SettingsManager(CONFIG_FILE)
         self.auth_manager = AuthenticationManager(self.api, CONFIG_FILE)
         self.ui_manager = UIManager(self.window)
-        self.epg_handler = EPGHandler(SERVER, use_https=USE_HTTPS)
+        self.epg_handler = EPGHandler(SERVER, use_https=USE_HTTPS, session=self.api.session)
         self.epg_manager = EPGManager(self.epg_handler, self.ui_manager)
         
         # Initialize playback manager
@@ -88,9 +97,7 @@ class ChumpStreamsApp:
             {}, # Empty auth initially
             self.content_manager, 
             self.player, 
-            self.buffer_settings,
-            use_https=USE_HTTPS,
-            server=SERVER
+            self.buffer_settings
         )
         
         # Migrate old favorites to enhanced format
@@ -112,9 +119,34 @@ class ChumpStreamsApp:
         self.search_results = []
         self.current_service = None
         
+        # Refreshing the live view after EPG loads is debounced, so several
+        # loads in quick succession only repopulate the info panel once
+        self._epg_refresh_timer = QTimer(self.window)
+        self._epg_refresh_timer.setSingleShot(True)
+        self._epg_refresh_timer.timeout.connect(self._refresh_current_live_selection)
+        
+        # Bumped for each live list, so only the latest EPG pre-mapping keeps running
+        self._epg_prewarm_generation = 0
+        
+        # Whether the content panel can show a favorite icon per list item
+        self._can_update_favorite_icon = hasattr(self.window.content_panel, 'update_favorite_status')
+        
+        # Favorite toggles that differ from toggling a category item
+        self._favorite_togglers = {
+            'favorites': self._remove_from_favorites_view
+        }
+        
+        # Info loaders for each content type, used when content is selected
+        self._info_loaders = {
+            'live': self._load_live_info,
+            'vod': self._load_vod_info,
+            'series': self._load_series_info,
+            'full_series': self._load_series_info,
+            'episode': self._display_episode_info
+        }
+        
         # Enable right-click favorites menu in content panel
-        if hasattr(self.window, 'content_panel'):
-            enable_favorite_context_menu(self.window.content_panel)
+        enable_favorite_context_menu(self.window.content_panel)
         
         # Disable all context menus except content panel
         disable_all_context_menus_except_content(self)
@@ -145,56 +177,64 @@ class ChumpStreamsApp:
                 logger.info("Live TV content type selected by default")
                 break
     
+    def _connect_once(self, signal, slot):
+        """Connect a signal to a slot unless they are already connected"""
+        try:
+            signal.connect(slot, Qt.UniqueConnection)
+        except TypeError:
+            # PyQt raises TypeError if the connection already exists
+            logger.debug(f"Signal already connected to {slot.__name__}")
+    
     def _connect_signals(self):
         """Connect UI signals to handlers"""
         # Login signals - handle service parameter
-        self.window.login_requested.connect(self._login)
-        self.window.logout_requested.connect(self._logout)
+        self._connect_once(self.window.login_requested, self._login)
+        self._connect_once(self.window.logout_requested, self._logout)
         
         # Service change signal
-        self.window.service_changed.connect(self._on_service_changed)
+        self._connect_once(self.window.service_changed, self._on_service_changed)
         
         # Settings signal
-        self.window.settings_requested.connect(self._show_settings)
+        self._connect_once(self.window.settings_requested, self._show_settings)
         
         # Category and content type signals
-        self.window.category_changed.connect(self._on_category_changed)
-        self.window.search_requested.connect(self._search)
+        self._connect_once(self.window.category_changed, self._on_category_changed)
+        self._connect_once(self.window.search_requested, self._search)
         
         # Content panel signals
         content = self.window.content_panel
-        content.content_selected.connect(self._on_content_selected)
-        content.content_play_requested.connect(self._play_content)
-        content.favorite_toggled.connect(self._toggle_favorite)
+        self._connect_once(content.content_selected, self._on_content_selected)
+        self._connect_once(content.content_play_requested, self._play_content)
+        self._connect_once(content.favorite_toggled, self._toggle_favorite)
         
         # Info panel signals
         info = self.window.info_panel
-        info.episode_selected.connect(self._on_episode_selected)
-        info.episode_play_requested.connect(self._play_episode)
-        info.series_favorite_toggled.connect(self._toggle_series_favorite)
-        info.content_play_requested.connect(self._play_content)
+        self._connect_once(info.episode_selected, self._on_episode_selected)
+        self._connect_once(info.episode_play_requested, self._play_episode)
+        self._connect_once(info.series_favorite_toggled, self._toggle_series_favorite)
+        self._connect_once(info.content_play_requested, self._play_content)
         
         # Add connections for Live TV and VOD favorite buttons
-        info.live_favorite_toggled.connect(self._toggle_favorite)
-        info.vod_favorite_toggled.connect(self._toggle_favorite)
+        self._connect_once(info.live_favorite_toggled, self._toggle_favorite)
+        self._connect_once(info.vod_favorite_toggled, self._toggle_favorite)
         
         # Player signals
-        self.player.player_started.connect(self._on_player_started)
-        self.player.player_exited.connect(self._on_player_exited)
+        self._connect_once(self.player.player_started, self._on_player_started)
+        self._connect_once(self.player.player_exited, self._on_player_exited)
         
         # Auth manager signals
-        self.auth_manager.login_succeeded.connect(self._on_login_success)
-        self.auth_manager.login_failed.connect(self._on_login_failed)
+        self._connect_once(self.auth_manager.login_succeeded, self._on_login_success)
+        self._connect_once(self.auth_manager.login_failed, self._on_login_failed)
         
         # EPG manager signals
-        self.epg_manager.epg_loaded.connect(self._on_epg_loaded)
-        self.epg_manager.epg_error.connect(self._on_epg_error)
+        self._connect_once(self.epg_manager.epg_loaded, self._on_epg_loaded)
+        self._connect_once(self.epg_manager.epg_error, self._on_epg_error)
     
     def _connect_epg_signals(self):
         """Connect EPG-related signals from UI to handlers"""
-        self.window.epg_debug_requested.connect(self._show_epg_debug)
-        self.window.epg_delete_requested.connect(self._clear_epg_cache)
-        self.window.epg_refresh_requested.connect(self._fetch_epg_data)
+        self._connect_once(self.window.epg_debug_requested, self._show_epg_debug)
+        self._connect_once(self.window.epg_delete_requested, self._clear_epg_cache)
+        self._connect_once(self.window.epg_refresh_requested, self._fetch_epg_data)
     
     def _load_config(self):
         """Load configuration from file"""
@@ -280,52 +320,12 @@ class ChumpStreamsApp:
             
             logger.info(f"Using service: {service.get('name', 'Unknown')} at {self.api.base_url}")
             
-            # Fix URL for EPG handler
-            if hasattr(self, 'epg_handler'):
-                fixed_url = url
-                if fixed_url.startswith('https://http://'):
-                    fixed_url = fixed_url.replace('https://', '', 1)
-                    use_https = False
-                elif fixed_url.startswith('http://https://'):
-                    fixed_url = fixed_url.replace('http://', '', 1)
-                    use_https = True
-                    
-                if fixed_url.startswith('http://') or fixed_url.startswith('https://'):
-                    # Extract domain without protocol
-                    if '://' in fixed_url:
-                        fixed_url = fixed_url.split('://', 1)[1]
-                    
-                    # Remove port if present
-                    if ':' in fixed_url:
-                        fixed_url = fixed_url.split(':', 1)[0]
-                
-                self.epg_handler.server = fixed_url
-                self.epg_handler.use_https = use_https
-            
-            # Fix URL for playback manager
-            if hasattr(self, 'playback_manager'):
-                fixed_url = url
-                if fixed_url.startswith('https://http://'):
-                    fixed_url = fixed_url.replace('https://', '', 1)
-                    use_https = False
-                elif fixed_url.startswith('http://https://'):
-                    fixed_url = fixed_url.replace('http://', '', 1)
-                    use_https = True
-                    
-                if fixed_url.startswith('http://') or fixed_url.startswith('https://'):
-                    # Extract domain without protocol
-                    if '://' in fixed_url:
-                        fixed_url = fixed_url.split('://', 1)[1]
-                    
-                    # Remove port if present
-                    if ':' in fixed_url:
-                        fixed_url = fixed_url.split(':', 1)[0]
-                
-                self.playback_manager.server = fixed_url
-                self.playback_manager.use_https = use_https
+            # Point the EPG handler at the same server. The playback manager
+            # builds its fallback URLs from the API client, so it follows along.
+            self.epg_handler.set_base_url(self.api.base_url, self.api.base_url.startswith('https://'))
         
-        # Call auth manager to handle login
-        self.auth_manager.login(username, password, remember, service)
+        # Call auth manager to handle login without blocking the UI
+        self.auth_manager.login_async(username, password, remember, service)
     
     def _logout(self):
         """Handle logout request"""
@@ -345,6 +345,10 @@ class ChumpStreamsApp:
         # Clear content
         self.window.content_panel.clear_content()
         self.window.info_panel.clear_info()
+        # Artwork and info for the old service's content is no longer needed
+        self.artwork_manager.cancel_prefetch()
+        self.artwork_manager.clear_url_cache()
+        self.content_manager.clear_info_cache()
     
     def _on_login_success(self, username):
         """Handle successful login"""
@@ -382,6 +386,11 @@ class ChumpStreamsApp:
         """Handle successful EPG loading"""
         self.ui_manager.show_status_message(status_message)
         
+        # Restarting the timer drops any refresh still pending
+        self._epg_refresh_timer.start(250)
+    
+    def _refresh_current_live_selection(self):
+        """Refresh the selected live channel so the info panel shows the latest EPG"""
         # If viewing a live channel, refresh the view
         if self.content_type == 'live':
             # Get current selection
@@ -397,19 +406,131 @@ class ChumpStreamsApp:
     
     def _preload_categories(self):
         """Preload categories for all content types"""
+        # Show categories from the disk cache straight away if we have them,
+        # then refresh them in the background
+        cached = self._load_cached_categories()
+        
+        # Remember which service the categories are requested for, so a
+        # response arriving after a service switch or logout is dropped
+        service_key = self._categories_service_key()
+        
+        if cached:
+            logger.info("Using cached categories while refreshing from server")
+            self._on_categories_loaded(cached, save=False)
+            self.content_manager.load_categories(
+                lambda categories: self._on_categories_refreshed(categories, service_key),
+                lambda error: logger.error(f"Error refreshing categories: {error}")
+            )
+            return
+        
         self.window.show_status_message("Loading categories...")
         
+        # Load categories for all content types in the background
+        self.content_manager.load_categories(
+            lambda categories: self._on_categories_loaded(categories, service_key=service_key),
+            self._on_categories_error
+        )
+    
+    def _categories_service_key(self):
+        """Get the key identifying the current service and account for cached categories"""
+        return f"{self.api.base_url}|{self.api.username}"
+    
+    def _is_current_service(self, service_key):
+        """Check whether categories requested for service_key still apply"""
+        return self.auth_manager.is_logged_in() and service_key == self._categories_service_key()
+    
+    def _categories_cache_path(self, content_type, service_key=None):
+        """Get the disk cache file for a content type's categories on a service, by default the current one"""
+        if service_key is None:
+            service_key = self._categories_service_key()
+        service_hash = hashlib.md5(service_key.encode()).hexdigest()[:8]
+        return os.path.join(CFG_DIR, "cache", f"categories_{service_hash}_{content_type}.json")
+    
+    def _load_cached_categories(self):
+        """Load categories from the disk cache, or None if any content type is missing or stale"""
+        categories = {}
         try:
-            # Load categories for all content types using the correct method
-            self.categories_by_type['live'] = self.api.get_categories('live')
-            logger.info(f"Loaded {len(self.categories_by_type['live'])} live categories")
+            for content_type in ('live', 'vod', 'series'):
+                cache_path = self._categories_cache_path(content_type)
+                if not os.path.exists(cache_path):
+                    return None
+                if os.path.getmtime(cache_path) < time.time() - CATEGORY_CACHE_TTL:
+                    logger.info(f"Cached {content_type} categories are stale")
+                    return None
+                with open(cache_path, 'r') as f:
+                    categories[content_type] = json.load(f)
+            return categories
+        except Exception as e:
+            logger.error(f"Error loading cached categories: {str(e)}")
+            return None
+    
+    def _save_cached_categories(self, categories, service_key=None):
+        """Save categories to the disk cache, skipping content types that failed to load"""
+        try:
+            os.makedirs(os.path.join(CFG_DIR, "cache"), exist_ok=True)
+            for content_type, type_categories in categories.items():
+                if not type_categories:
+                    continue
+                cache_path = self._categories_cache_path(content_type, service_key)
+                temp_path = cache_path + '.tmp'
+                with open(temp_path, 'w') as f:
+                    json.dump(type_categories, f)
+                os.replace(temp_path, cache_path)
+        except Exception as e:
+            logger.error(f"Error saving categories to cache: {str(e)}")
+    
+    def _on_categories_refreshed(self, categories, service_key):
+        """Handle fresh categories arriving after cached ones were shown"""
+        if not self._is_current_service(service_key):
+            logger.info("Ignoring categories refreshed for a previous service")
+            return
+        
+        self._save_cached_categories(categories, service_key)
+        
+        # Keep the cached list for any content type the server failed to return
+        changed_types = set()
+        for content_type, type_categories in categories.items():
+            if type_categories and type_categories != self.categories_by_type.get(content_type):
+                self.categories_by_type[content_type] = type_categories
+                changed_types.add(content_type)
+        
+        if changed_types:
+            logger.info("Categories changed on server, updated from refresh")
+        
+        if self.content_type in changed_types:
+            # Only the category list changes; the user's current selection is left alone
+            categories_list = self.window.category_panel.categories_list
+            current_item = categories_list.currentItem()
+            current_name = current_item.text() if current_item else None
             
-            self.categories_by_type['vod'] = self.api.get_categories('vod')
-            logger.info(f"Loaded {len(self.categories_by_type['vod'])} VOD categories")
+            category_names = [cat['category_name'] for cat in self.categories_by_type[self.content_type]]
+            self.window.category_panel.set_categories(category_names)
             
-            self.categories_by_type['series'] = self.api.get_categories('series')
+            if current_name in category_names:
+                categories_list.setCurrentRow(category_names.index(current_name))
+    
+    def _on_categories_loaded(self, categories, save=True, service_key=None):
+        """Handle categories loaded for all content types"""
+        if service_key is not None and not self._is_current_service(service_key):
+            logger.info("Ignoring categories loaded for a previous service")
+            return
+        
+        try:
+            if save:
+                self._save_cached_categories(categories, service_key)
+            self.categories_by_type.update(categories)
+            logger.info(f"Loaded {len(self.categories_by_type['live'])} live categories")
+            logger.info(f"Loaded {len(self.categories_by_type['vod'])} VOD categories")
             logger.info(f"Loaded {len(self.categories_by_type['series'])} series categories")
             
+            # Let the user know if any content type came back empty, since
+            # a failed request for one type doesn't stop the others loading
+            empty_types = [ctype for ctype in ('live', 'vod', 'series') if not self.categories_by_type.get(ctype)]
+            if empty_types:
+                self.window.show_status_message(f"No categories loaded for: {', '.join(empty_types)}")
+            else:
+                self.window.show_status_message("Categories loaded")
+            
             # Always start with Live TV content type
             current_type = "live"
             logger.info(f"Setting initial content type to: {current_type}")
@@ -418,12 +539,17 @@ class ChumpStreamsApp:
             self._force_select_live_tv()
             
             # Manually trigger content type loading for Live TV
-            QTimer.singleShot(100, lambda: self._update_categories_for_type(current_type))
+            QTimer.singleShot(0, lambda: self._update_categories_for_type(current_type))
             
         except Exception as e:
             logger.error(f"Error loading categories: {str(e)}")
             self.window.show_error_message("Error", f"Failed to load categories: {str(e)}")
     
+    def _on_categories_error(self, error_message):
+        """Handle category loading error"""
+        logger.error(f"Error loading categories: {error_message}")
+        self.window.show_error_message("Error", f"Failed to load categories: {error_message}")
+    
     def _update_categories_for_type(self, content_type):
         """Update categories in UI for selected content type"""
         if content_type == 'favorites':
@@ -435,13 +561,8 @@ class ChumpStreamsApp:
         
         logger.info(f"Updating UI with {len(category_names)} {content_type} categories")
         
-        # Update category list in UI - force with direct method call
-        # to ensure categories are updated
-        self.window.category_panel.categories_list.clear()
-        self.window.category_panel.categories_list.addItems(category_names)
-        
-        # Process events to ensure UI updates
-        QApplication.processEvents()
+        # Update category list in UI
+        self.window.category_panel.set_categories(category_names)
         
         # Log actual count
         after_count = self.window.category_panel.categories_list.count()
@@ -453,31 +574,28 @@ class ChumpStreamsApp:
             default = DEFAULT_CATEGORIES.get(content_type, '')
             logger.info(f"Looking for default category: {default}")
             
-            # Try to find exact match first
+            # Prefer the configured default, then a UK entertainment
+            # category, then just the first one
             if default in category_names:
                 category_name = default
                 logger.info(f"Found exact match for default category: {category_name}")
             else:
-                # Try to find partial match
-                for name in category_names:
-                    if "uk" in name.lower() and "entertainment" in name.lower():
-                        category_name = name
-                        logger.info(f"Found partial match for default category: {category_name}")
-                        break
-                        
-                # If still no match, use first category
-                if not 'category_name' in locals() and category_names:
+                category_name = next(
+                    (name for name in category_names
+                     if "uk" in name.lower() and "entertainment" in name.lower()),
+                    None
+                )
+                if category_name:
+                    logger.info(f"Found partial match for default category: {category_name}")
+                else:
                     category_name = category_names[0]
                     logger.info(f"Using first category as default: {category_name}")
             
             # Select the category in the UI
-            if 'category_name' in locals():
-                logger.info(f"Selecting default category: {category_name}")
-                items = self.window.category_panel.categories_list.findItems(category_name, Qt.MatchExactly)
-                if items:
-                    self.window.category_panel.categories_list.setCurrentItem(items[0])
-                    # Load content for the default category
-                    self._load_content_for_category(content_type, category_name)
+            logger.info(f"Selecting default category: {category_name}")
+            self.window.category_panel.categories_list.setCurrentRow(category_names.index(category_name))
+            # Load content for the default category
+            self._load_content_for_category(content_type, category_name)
     
     def _on_category_changed(self, content_type, category_name):
         """Handle category change"""
@@ -499,7 +617,7 @@ class ChumpStreamsApp:
         # If category name is empty but content type changed, 
         # update the categories for that type
         if not category_name:
-            QTimer.singleShot(100, lambda: self._update_categories_for_type(content_type))
+            QTimer.singleShot(0, lambda: self._update_categories_for_type(content_type))
             return
         
         # Load content for the specified category
@@ -544,30 +662,24 @@ class ChumpStreamsApp:
         self.content_items = items
         
         # Set content items on the content panel for the context menu to work
-        if hasattr(self.window.content_panel, 'content_items'):
-            self.window.content_panel.content_items = items
-        if hasattr(self.window.content_panel, 'content_type'):
-            self.window.content_panel.content_type = content_type
+        self.window.content_panel.content_items = items
+        self.window.content_panel.content_type = content_type
         
         # Pre-mark favorites for UI consistency
-        for item in items:
-            is_fav = self.favorites_manager.is_favorite(item, content_type)
-            item['is_favorite'] = is_fav
-        
-        # Extract display names
-        display_names = []
-        for item in items:
-            name = item.get('name', item.get('title', 'Unknown'))
-            if content_type == 'live':
-                display_names.append(name)
-            elif content_type == 'vod':
-                # Add year to movie name if available
-                if 'year' in item:
-                    display_names.append(f"{name} ({item['year']})")
-                else:
-                    display_names.append(name)
-            elif content_type == 'series':
-                display_names.append(name)
+        self.favorites_manager.sync_favorite_status(items, content_type)
+        
+        # Extract display names, choosing the format once rather than per item
+        if content_type == 'vod':
+            # Add year to movie name if available
+            display_names = [
+                f"{name} ({item['year']})" if 'year' in item else name
+                for item in items
+                for name in (item.get('name', item.get('title', 'Unknown')),)
+            ]
+        elif content_type in ('live', 'series'):
+            display_names = [item.get('name', item.get('title', 'Unknown')) for item in items]
+        else:
+            display_names = []
         
         # Update content panel
         self.ui_manager.update_content(content_type, items, display_names)
@@ -579,8 +691,34 @@ class ChumpStreamsApp:
         self.ui_manager.show_status_message(f"Loaded {len(items)} items")
         
         # Re-apply right-click favorites menu in case the content list was recreated
-        if hasattr(self.window, 'content_panel'):
-            enable_favorite_context_menu(self.window.content_panel)
+        enable_favorite_context_menu(self.window.content_panel)
+        
+        # Map the channels to EPG IDs in the background so selecting one is quick
+        if content_type == 'live':
+            channel_names = [item.get('name', '') for item in items]
+            self._epg_prewarm_generation += 1
+            thread = threading.Thread(
+                target=self._prewarm_epg_mappings,
+                args=(channel_names, self._epg_prewarm_generation)
+            )
+            thread.daemon = True
+            thread.start()
+        
+        # Fetch artwork for the first items while the user is still browsing
+        self.artwork_manager.cancel_prefetch()
+        self.artwork_manager.prefetch(items[:50], content_type)
+    
+    def _prewarm_epg_mappings(self, channel_names, generation):
+        """Fill the EPG handler's mapping cache for a list of channels"""
+        try:
+            map_stream_to_epg = self.epg_handler.map_stream_to_epg
+            for channel_name in channel_names:
+                # Stop once a newer live list has started its own pre-mapping
+                if generation != self._epg_prewarm_generation:
+                    return
+                map_stream_to_epg(channel_name)
+        except Exception as e:
+            logger.error(f"Error pre-mapping channels to EPG: {str(e)}")
     
     def _on_content_error(self, error):
         """Handle content loading error"""
@@ -589,6 +727,17 @@ class ChumpStreamsApp:
     
     def _display_favorites(self):
         """Display favorites in the content panel"""
+        # Hold repaints while the panels are updated, so switching to
+        # favorites repaints once rather than after every change.
+        # Re-enabling updates schedules the repaint.
+        self.window.setUpdatesEnabled(False)
+        try:
+            self._populate_favorites()
+        finally:
+            self.window.setUpdatesEnabled(True)
+    
+    def _populate_favorites(self):
+        """Fill the content, info and category panels for the favorites view"""
         # Extract items from favorites
         items = self.favorites
         
@@ -619,10 +768,8 @@ class ChumpStreamsApp:
         self.ui_manager.update_content('favorites', items, display_names)
         
         # Set content items on the content panel for the context menu to work
-        if hasattr(self.window.content_panel, 'content_items'):
-            self.window.content_panel.content_items = items
-        if hasattr(self.window.content_panel, 'content_type'):
-            self.window.content_panel.content_type = 'favorites'
+        self.window.content_panel.content_items = items
+        self.window.content_panel.content_type = 'favorites'
         
         # Clear info panel
         self.ui_manager.clear_info()
@@ -634,8 +781,7 @@ class ChumpStreamsApp:
         self.window.show_status_message(f"Loaded {len(items)} favorites")
         
         # Re-apply right-click favorites menu in case the content list was recreated
-        if hasattr(self.window, 'content_panel'):
-            enable_favorite_context_menu(self.window.content_panel)
+        enable_favorite_context_menu(self.window.content_panel)
     
     def _on_content_selected(self, items, index):
         """Handle content selection"""
@@ -658,17 +804,27 @@ class ChumpStreamsApp:
             content_type = self.content_type
             
         # Load info based on content type
-        if content_type == 'live':
-            self._load_live_info(item)
-        elif content_type == 'vod':
-            self._load_vod_info(item)
-        elif content_type == 'series' or content_type == 'full_series':
-            self._load_series_info(item)
-        elif content_type == 'episode':
-            self._display_episode_info(item)
+        info_loader = self._info_loaders.get(content_type)
+        if info_loader:
+            info_loader(item)
         else:
             logger.error(f"Unknown content type: {content_type}")
             self.window.show_error_message("Error", f"Unknown content type: {content_type}")
+            return
+        
+        # Load the neighbouring items' info as well while browsing a category,
+        # so moving through the list with the arrow keys finds it cached
+        if self.content_type in ('vod', 'series'):
+            neighbours = [items[i] for i in (index - 1, index + 1) if 0 <= i < len(items)]
+            if content_type == 'series':
+                neighbour_ids = [neighbour.get('series_id') for neighbour in neighbours]
+            else:
+                neighbour_ids = [neighbour.get('stream_id') or neighbour.get('vod_id') for neighbour in neighbours]
+            self.content_manager.prefetch_info(
+                self.auth_manager.get_auth(),
+                content_type,
+                [item_id for item_id in neighbour_ids if item_id]
+            )
     
     def _load_live_info(self, channel):
         """Load info for live channel"""
@@ -705,46 +861,23 @@ class ChumpStreamsApp:
         if epg_channel_id:
             logger.info(f"Found EPG channel ID: {epg_channel_id}")
             
-            # Get the current and next program
-            current_program = self.epg_handler.get_current_program(epg_channel_id)
-            next_program = self.epg_handler.get_next_program(epg_channel_id)
+            # Get the current and next program, already formatted for display.
+            # These are cached by the EPG handler, so flicking back and forth
+            # between channels doesn't reformat them every time.
+            current_program, next_program = self.epg_handler.get_formatted_now_next(epg_channel_id)
             
             if current_program:
-                logger.info(f"Current program: {current_program.get('title')}")
+                logger.info(f"Current program: {current_program['title']}")
+                channel_with_epg['current_program'] = current_program
             else:
                 logger.info("No current program found")
                 
             if next_program:
-                logger.info(f"Next program: {next_program.get('title')}")
+                logger.info(f"Next program: {next_program['title']}")
+                channel_with_epg['next_program'] = next_program
             else:
                 logger.info("No next program found")
             
-            # Add program info to the channel data
-            
-            if current_program:
-                channel_with_epg['current_program'] = {
-                    'title': current_program.get('title', 'Unknown'),
-                    'start_time': self.epg_handler.format_epg_time(current_program.get('start_timestamp')),
-                    'end_time': self.epg_handler.format_epg_time(current_program.get('stop_timestamp')),
-                    'description': current_program.get('description', ''),
-                    'duration': self.epg_handler._format_duration(
-                        current_program.get('start_timestamp'),
-                        current_program.get('stop_timestamp')
-                    )
-                }
-            
-            if next_program:
-                channel_with_epg['next_program'] = {
-                    'title': next_program.get('title', 'Unknown'),
-                    'start_time': self.epg_handler.format_epg_time(next_program.get('start_timestamp')),
-                    'end_time': self.epg_handler.format_epg_time(next_program.get('stop_timestamp')),
-                    'description': next_program.get('description', ''),
-                    'duration': self.epg_handler._format_duration(
-                        next_program.get('start_timestamp'),
-                        next_program.get('stop_timestamp')
-                    )
-                }
-            
             # Get the full EPG for the next 12 hours
             epg_list = self.epg_handler.get_formatted_epg_for_channel(epg_channel_id, hours=12)
             logger.info(f"Retrieved {len(epg_list)} EPG entries for the next 12 hours")
@@ -785,14 +918,15 @@ class ChumpStreamsApp:
     
     def _on_movie_info_loaded(self, movie, info_result):
         """Handle loaded movie info"""
-        # Combine movie with info
-        movie_with_info = dict(movie)
+        # Combine movie with info. The info is merged straight into the
+        # content item, except for favorites, whose items are saved to the
+        # config and shouldn't pick up the extra fields.
+        movie_with_info = dict(movie) if self.content_type == 'favorites' else movie
         if 'info' in info_result:
             # Copy relevant fields from info to movie
             info = info_result['info']
-            for key in ['plot', 'genre', 'rating', 'duration', 'director', 'cast']:
-                if key in info:
-                    movie_with_info[key] = info[key]
+            if isinstance(info, dict):
+                movie_with_info.update((key, info[key]) for key in _VOD_INFO_KEYS & info.keys())
         
         # Check if this movie is a favorite
         is_favorite = self.favorites_manager.is_favorite(movie, 'vod')
@@ -836,9 +970,8 @@ class ChumpStreamsApp:
         if 'info' in info_result:
             # Copy relevant fields from info to series
             info = info_result['info']
-            for key in ['plot', 'genre', 'rating', 'cast', 'director']:
-                if key in info:
-                    series_with_info[key] = info[key]
+            if isinstance(info, dict):
+                series_with_info.update((key, info[key]) for key in _SERIES_INFO_KEYS & info.keys())
         
         # Add episodes
         episodes = info_result.get('episodes', [])
@@ -917,51 +1050,60 @@ class ChumpStreamsApp:
     
     def _toggle_favorite(self, item):
         """Toggle favorite status for content item"""
-        # Determine content type and proper item
         content_type = self.content_type
         
         # Enhanced logging for debugging favorites issue
         logger.info(f"Toggle favorite called for content_type: {content_type}")
         
-        if content_type == 'favorites':
-            # When removing from favorites view
-            fav_item = item
-            logger.info(f"Removing from favorites view: {fav_item.get('label', 'Unknown')}")
+        self._favorite_togglers.get(content_type, self._toggle_item_favorite)(item)
+    
+    def _remove_from_favorites_view(self, item):
+        """Remove the selected favorite while viewing favorites"""
+        fav_item = item
+        logger.info(f"Removing from favorites view: {fav_item.get('label', 'Unknown')}")
+        
+        try:
+            # Get the current row/index directly from the content panel
+            current_index = self.window.content_panel.content_list.currentRow()
             
-            try:
-                # Get the current row/index directly from the content panel
-                current_index = self.window.content_panel.content_list.currentRow()
+            if current_index >= 0 and current_index < len(self.favorites):
+                # Direct removal by index - safer than searching
+                removed_item = self.favorites[current_index]
+                logger.info(f"Removing favorite at index {current_index}: {removed_item.get('label')}")
                 
-                if current_index >= 0 and current_index < len(self.favorites):
-                    # Direct removal by index - safer than searching
-                    removed_item = self.favorites[current_index]
-                    logger.info(f"Removing favorite at index {current_index}: {removed_item.get('label')}")
-                    
-                    # FIXED: First remove from favorites manager, then update local list
-                    # This ensures we're working with a consistent state
-                    self.favorites_manager.remove_favorite_by_index(current_index)
-                    
-                    # Now refresh our local favorites list from the manager
-                    self.favorites = self.favorites_manager.get_all_favorites()
-                    
-                    # Force save to file
-                    self.favorites_manager._save_favorites()
-                    logger.info("Saved favorites to file")
-                    
-                    # Refresh favorites view
-                    self._display_favorites()
-                    self.window.show_info_message("Favorites", "Removed from favorites")
+                # FIXED: First remove from favorites manager, then update local list
+                # This ensures we're working with a consistent state
+                self.favorites_manager.remove_favorite_by_index(current_index)
+                
+                # Now refresh our local favorites list from the manager,
+                # which saves the change to file shortly afterwards
+                self.favorites = self.favorites_manager.get_all_favorites()
+                
+                # Remove just that row from the favorites view. The panel
+                # shares the manager's list, so its items are already
+                # updated. Rebuild the view if they've got out of step,
+                # or to show the empty message once the last one is gone.
+                content_panel = self.window.content_panel
+                if (self.favorites and content_panel.content_items is self.favorites
+                        and content_panel.content_list.count() == len(self.favorites) + 1):
+                    content_panel.content_list.takeItem(current_index)
+                    self.ui_manager.clear_info()
+                    self.window.show_status_message(f"Loaded {len(self.favorites)} favorites")
                 else:
-                    logger.error(f"Invalid index {current_index} for favorites list of size {len(self.favorites)}")
-                    self.window.show_error_message("Favorites", "Invalid favorite selected")
-                    
-            except Exception as e:
-                logger.error(f"Error removing favorite: {str(e)}")
-                logger.error(traceback.format_exc())
-                self.window.show_error_message("Favorites", f"Error removing favorite: {str(e)}")
-            return
+                    self._display_favorites()
+                self.window.show_info_message("Favorites", "Removed from favorites")
+            else:
+                logger.error(f"Invalid index {current_index} for favorites list of size {len(self.favorites)}")
+                self.window.show_error_message("Favorites", "Invalid favorite selected")
+                
+        except Exception as e:
+            logger.exception("Error removing favorite: %s", e)
+            self.window.show_error_message("Favorites", f"Error removing favorite: {str(e)}")
+    
+    def _toggle_item_favorite(self, item):
+        """Toggle favorite status for an item in the current content list"""
+        content_type = self.content_type
         
-        # Other content types - toggle favorite status
         try:
             # Log item details for debugging
             if content_type == 'vod':
@@ -974,9 +1116,7 @@ class ChumpStreamsApp:
             # Toggle favorite status
             is_favorite = self.favorites_manager.toggle_favorite(item, content_type)
             
-            # Force save to file
-            self.favorites_manager._save_favorites()
-            logger.info(f"Saved favorites after toggle, is now favorite: {is_favorite}")
+            logger.info(f"Toggled favorite, is now favorite: {is_favorite}")
             
             # Refresh favorites list from manager
             self.favorites = self.favorites_manager.get_all_favorites()
@@ -986,43 +1126,32 @@ class ChumpStreamsApp:
             self.window.show_info_message("Favorites", f"{action} favorites")
             
             # Update UI to reflect new favorite status - this ensures both icons and context menus are in sync
-            if content_type == 'live':
-                item['is_favorite'] = is_favorite
-                self.window.info_panel.set_content_info(item, 'live')
-                
-                # Also update the content panel favorite icon if applicable
-                current_index = self.window.content_panel.content_list.currentRow()
-                if current_index >= 0 and current_index < len(self.content_items):
-                    selected_item = self.content_items[current_index]
-                    if selected_item.get('stream_id') == item.get('stream_id'):
-                        # Update favorite icon in the current list item
-                        if hasattr(self.window.content_panel, 'update_favorite_status'):
-                            self.window.content_panel.update_favorite_status(current_index, is_favorite)
-                        
-                        # Also update the selected item's favorite status
-                        selected_item['is_favorite'] = is_favorite
-                        
-            elif content_type == 'vod':
+            if content_type in ('live', 'vod'):
                 item['is_favorite'] = is_favorite
-                self.window.info_panel.set_content_info(item, 'vod')
-                
-                # Also update the content panel favorite icon if applicable
-                current_index = self.window.content_panel.content_list.currentRow()
-                if current_index >= 0 and current_index < len(self.content_items):
-                    selected_item = self.content_items[current_index]
-                    if selected_item.get('stream_id') == item.get('stream_id'):
-                        # Update favorite icon in the current list item
-                        if hasattr(self.window.content_panel, 'update_favorite_status'):
-                            self.window.content_panel.update_favorite_status(current_index, is_favorite)
-                        
-                        # Also update the selected item's favorite status
-                        selected_item['is_favorite'] = is_favorite
+                self.window.info_panel.set_content_info(item, content_type)
+                self._sync_selected_favorite(item, is_favorite, 'stream_id')
         
         except Exception as e:
-            logger.error(f"Error toggling favorite: {str(e)}")
-            logger.error(traceback.format_exc())
+            logger.exception("Error toggling favorite: %s", e)
             self.window.show_error_message("Favorites", f"Error toggling favorite: {str(e)}")
     
+    def _sync_selected_favorite(self, item, is_favorite, id_key):
+        """Update the selected content list item if it is the item whose favorite status changed"""
+        current_index = self.window.content_panel.content_list.currentRow()
+        if current_index < 0 or current_index >= len(self.content_items):
+            return
+        
+        selected_item = self.content_items[current_index]
+        if selected_item.get(id_key) != item.get(id_key):
+            return
+        
+        # Update favorite icon in the current list item
+        if self._can_update_favorite_icon:
+            self.window.content_panel.update_favorite_status(current_index, is_favorite)
+        
+        # Also update the selected item's favorite status
+        selected_item['is_favorite'] = is_favorite
+    
     def _toggle_series_favorite(self, series):
         """Toggle favorite status for TV series"""
         if not series:
@@ -1032,9 +1161,7 @@ class ChumpStreamsApp:
             # Toggle favorite status
             is_favorite = self.favorites_manager.toggle_series_favorite(series)
             
-            # Force save to file
-            self.favorites_manager._save_favorites()
-            logger.info(f"Saved favorites after series toggle, is now favorite: {is_favorite}")
+            logger.info(f"Toggled series favorite, is now favorite: {is_favorite}")
             
             # Refresh favorites list
             self.favorites = self.favorites_manager.get_all_favorites()
@@ -1045,17 +1172,7 @@ class ChumpStreamsApp:
             # Update UI
             self.window.info_panel.set_content_info(series, 'series')
             
-            # Also update the content panel favorite icon if applicable
-            current_index = self.window.content_panel.content_list.currentRow()
-            if current_index >= 0 and current_index < len(self.content_items):
-                selected_item = self.content_items[current_index]
-                if selected_item.get('series_id') == series.get('series_id'):
-                    # Update favorite icon in the current list item
-                    if hasattr(self.window.content_panel, 'update_favorite_status'):
-                        self.window.content_panel.update_favorite_status(current_index, is_favorite)
-                    
-                    # Also update the selected item's favorite status
-                    selected_item['is_favorite'] = is_favorite
+            self._sync_selected_favorite(series, is_favorite, 'series_id')
             
             # Show message
             action = "Added to" if is_favorite else "Removed from"
@@ -1063,8 +1180,7 @@ class ChumpStreamsApp:
             self.window.show_info_message("Favorites", f"Series '{series_name}' {action} favorites")
         
         except Exception as e:
-            logger.error(f"Error toggling series favorite: {str(e)}")
-            logger.error(traceback.format_exc())
+            logger.exception("Error toggling series favorite: %s", e)
             self.window.show_error_message("Favorites", f"Error toggling favorite: {str(e)}")
     
     def _search(self, search_term):
@@ -1092,27 +1208,22 @@ class ChumpStreamsApp:
         self.content_type = 'search'  # Set content type to search
         
         # Set content items on the content panel for the context menu to work
-        if hasattr(self.window.content_panel, 'content_items'):
-            self.window.content_panel.content_items = results
-        if hasattr(self.window.content_panel, 'content_type'):
-            self.window.content_panel.content_type = 'search'
+        self.window.content_panel.content_items = results
+        self.window.content_panel.content_type = 'search'
         
-        # Extract display names with content type prefix
-        display_names = []
+        # Pre-mark favorites for UI consistency, a content type at a time
+        # since search results mix them
+        results_by_type = {}
         for item in results:
-            name = item.get('name', item.get('title', 'Unknown'))
-            content_type = item.get('content_type', 'unknown')
-            
-            if content_type == 'live':
-                prefix = "[Live] "
-            elif content_type == 'vod':
-                prefix = "[Movie] "
-            elif content_type == 'series':
-                prefix = "[Series] "
-            else:
-                prefix = ""
-                
-            display_names.append(f"{prefix}{name}")
+            results_by_type.setdefault(item.get('content_type'), []).append(item)
+        for content_type, items in results_by_type.items():
+            self.favorites_manager.sync_favorite_status(items, content_type)
+        
+        # Extract display names with content type prefix
+        display_names = [
+            f"{_SEARCH_RESULT_PREFIXES.get(item.get('content_type'), '')}{item.get('name', item.get('title', 'Unknown'))}"
+            for item in results
+        ]
         
         # Update content panel
         self.ui_manager.update_content('search', results, display_names)
@@ -1124,8 +1235,7 @@ class ChumpStreamsApp:
         self.window.show_status_message(f"Found {len(results)} results for '{search_term}'")
         
         # Re-apply right-click favorites menu in case the content list was recreated
-        if hasattr(self.window, 'content_panel'):
-            enable_favorite_context_menu(self.window.content_panel)
+        enable_favorite_context_menu(self.window.content_panel)
     
     def _on_search_progress(self, current, total):
         """Handle search progress updates"""
@@ -1197,18 +1307,8 @@ class ChumpStreamsApp:
         if not hasattr(self, 'image_cache'):
             return 0
             
-        cache_dir = self.image_cache.cache_dir
-        if not os.path.exists(cache_dir):
-            return 0
-            
-        total_size = 0
-        for dirpath, dirnames, filenames in os.walk(cache_dir):
-            for f in filenames:
-                fp = os.path.join(dirpath, f)
-                total_size += os.path.getsize(fp)
-        
         # Convert bytes to MB
-        return total_size / (1024 * 1024)
+        return self.image_cache.get_cache_size() / (1024 * 1024)
     
     def _show_settings(self):
         """Show settings dialog"""
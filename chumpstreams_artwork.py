@@ -9,14 +9,78 @@ Handles extraction and display of artwork for content
 """
 import logging
 import re
-from PyQt5.QtCore import Qt, QObject, pyqtSlot
-from PyQt5.QtGui import QPixmap
+import weakref
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+from PyQt5.QtGui import QImageReader, QPixmap
 
 logger = logging.getLogger('chumpstreams')
 
+# Image tags embedded in VOD/series plot HTML
+_IMG_SRC_RE = re.compile(r'<img[^>]+src=[\'"]([^\'"]+)[\'"]')
+
+# Base URLs for relative TMDB image paths
+_TMDB_POSTER_BASE = "https://image.tmdb.org/t/p/w500"
+_TMDB_BACKDROP_BASE = "https://image.tmdb.org/t/p/original"
+
+class PrefetchWorker(QRunnable):
+    """Worker for downloading artwork into the cache ahead of display"""
+    
+    def __init__(self, manager, url, generation):
+        super().__init__()
+        self.manager = manager
+        self.url = url
+        self.generation = generation
+    
+    @pyqtSlot()
+    def run(self):
+        """Run artwork download task"""
+        # Skip prefetches queued before the content was replaced
+        if self.generation != self.manager.prefetch_generation:
+            return
+        try:
+            self.manager.image_cache.cache_image(self.url)
+        except Exception as e:
+            logger.error(f"Error prefetching artwork {self.url}: {str(e)}")
+
+
+class ScaleWorker(QRunnable):
+    """Worker for decoding and scaling downloaded artwork off the UI thread"""
+    
+    class Signals(QObject):
+        """Signals for ScaleWorker"""
+        finished = pyqtSignal(object)
+    
+    def __init__(self, path, width, height):
+        super().__init__()
+        self.path = path
+        self.width = width
+        self.height = height
+        self.signals = self.Signals()
+    
+    @pyqtSlot()
+    def run(self):
+        """Run image scaling task"""
+        # QImage can be used outside the UI thread, unlike QPixmap. Large
+        # images are decoded straight at the display size, which lets the
+        # JPEG decoder skip most of the work instead of scaling afterwards.
+        reader = QImageReader(self.path)
+        size = reader.size()
+        if size.isValid() and (size.width() > self.width or size.height() > self.height):
+            reader.setScaledSize(size.scaled(self.width, self.height, Qt.KeepAspectRatio))
+            reader.setQuality(100)
+        self.signals.finished.emit(reader.read())
+
+
 class ArtworkManager(QObject):
     """Manager for handling artwork for movies and series"""
     
+    # Maximum display size of each kind of artwork
+    _ARTWORK_SIZES = {
+        'poster': (300, 450),
+        'backdrop': (800, 450)
+    }
+    
     def __init__(self, image_cache):
         """
         Initialize the artwork manager
@@ -32,10 +96,64 @@ class ArtworkManager(QObject):
         
         # Keep track of which URLs are associated with which info panels
         self.active_panels = {}
+        # Panels waiting for each URL, so a finished download doesn't scan them all
+        self._url_to_targets = {}  # url -> set of (panel_id, 'poster' or 'backdrop')
+        
+        # Own pool for prefetching artwork, so it doesn't compete with content
+        # loading. Downloads are latency bound, so keep as many in flight as
+        # the image cache's connection pool holds.
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(8)
+        self.prefetch_generation = 0
+        
+        # Extracted artwork URLs, so revisited lists don't walk every item again
+        self._url_cache = OrderedDict()  # (content_type, item_id) -> (poster_url, backdrop_url)
+        self.url_cache_size = 4096
+    
+    def prefetch(self, items, content_type):
+        """
+        Download artwork for content items in the background
+        
+        Args:
+            items: List of content item dicts
+            content_type: Type of content ('live', 'vod', 'series', etc.)
+        """
+        generation = self.prefetch_generation
+        
+        # Items often share artwork (e.g. channel logos), so queue each URL once
+        queued = set()
+        for urls in self.extract_image_urls(items, content_type):
+            for url in urls:
+                if url and url not in queued:
+                    queued.add(url)
+                    self.thread_pool.start(PrefetchWorker(self, url, generation))
+    
+    def cancel_prefetch(self):
+        """Drop any artwork prefetches that haven't started yet"""
+        self.prefetch_generation += 1
+        self.thread_pool.clear()
+    
+    def clear_url_cache(self):
+        """Drop extracted artwork URLs, e.g. when switching to another service"""
+        self._url_cache.clear()
+    
+    def _url_cache_key(self, item, content_type):
+        """Get the URL cache key for an item, or None if it has no ID"""
+        item_id = item.get('stream_id') or item.get('series_id') or item.get('id')
+        if not item_id:
+            return None
+        return (content_type, item_id)
+    
+    def _store_urls(self, key, urls):
+        """Remember extracted URLs, evicting the least recently used"""
+        self._url_cache[key] = urls
+        self._url_cache.move_to_end(key)
+        if len(self._url_cache) > self.url_cache_size:
+            self._url_cache.popitem(last=False)
     
     def extract_image_url(self, item, content_type):
         """
-        Extract image URL from content item
+        Extract image URL from content item, using cached URLs if available
         
         Args:
             item: Content item dict
@@ -44,54 +162,90 @@ class ArtworkManager(QObject):
         Returns:
             tuple: (poster_url, backdrop_url)
         """
+        key = self._url_cache_key(item, content_type)
+        if key is None:
+            return self._extract_image_url(item, content_type)
+        
+        urls = self._url_cache.get(key)
+        if urls is not None:
+            self._url_cache.move_to_end(key)
+            return urls
+        
+        urls = self._extract_image_url(item, content_type)
+        self._store_urls(key, urls)
+        return urls
+    
+    def extract_image_urls(self, items, content_type):
+        """
+        Extract image URLs for a list of content items, using cached URLs if available
+        
+        Args:
+            items: List of content item dicts
+            content_type: Type of content ('live', 'vod', 'series', etc.)
+            
+        Returns:
+            list: (poster_url, backdrop_url) tuple for each item
+        """
+        url_cache = self._url_cache
+        cache_key = self._url_cache_key
+        extract = self._extract_image_url
+        
+        results = []
+        for item in items:
+            key = cache_key(item, content_type)
+            urls = url_cache.get(key) if key is not None else None
+            if urls is None:
+                urls = extract(item, content_type)
+                if key is not None:
+                    self._store_urls(key, urls)
+            else:
+                url_cache.move_to_end(key)
+            results.append(urls)
+        return results
+    
+    def _extract_image_url(self, item, content_type):
+        """Extract image URLs from a content item without using the cache"""
         poster_url = None
         backdrop_url = None
         
         try:
-            # Check for direct image URLs in the item
-            if 'cover' in item:
-                poster_url = self._ensure_string(item['cover'])
-            elif 'cover_big' in item:
-                poster_url = self._ensure_string(item['cover_big'])
-            elif 'stream_icon' in item:
-                poster_url = self._ensure_string(item['stream_icon'])
+            ensure_string = self._ensure_string
+            get = item.get
+            
+            # Check for direct image URLs in the item, skipping empty ones
+            poster_url = ensure_string(get('cover') or get('cover_big') or get('stream_icon'))
                 
             # Check for backdrop URL
-            if 'backdrop_path' in item:
-                backdrop_url = self._ensure_string(item['backdrop_path'])
-            elif 'backdrop' in item:
-                backdrop_url = self._ensure_string(item['backdrop'])
+            backdrop_url = ensure_string(get('backdrop_path') or get('backdrop'))
             
             # If info field exists, check there too
-            if 'info' in item:
-                info = item['info']
-                if not poster_url and 'poster_path' in info:
-                    poster_url = self._ensure_string(info['poster_path'])
-                if not poster_url and 'cover' in info:
-                    poster_url = self._ensure_string(info['cover'])
-                if not backdrop_url and 'backdrop_path' in info:
-                    backdrop_url = self._ensure_string(info['backdrop_path'])
+            info = get('info')
+            if isinstance(info, dict):
+                if not poster_url:
+                    poster_url = ensure_string(info.get('poster_path') or info.get('cover'))
+                if not backdrop_url:
+                    backdrop_url = ensure_string(info.get('backdrop_path'))
                     
             # For VOD/Series, try to extract from the plot which might contain HTML with images
-            if content_type in ['vod', 'series'] and 'plot' in item:
-                plot = item.get('plot', '')
-                if isinstance(plot, str):  # Ensure plot is a string before using regex
+            if content_type in ('vod', 'series'):
+                plot = get('plot')
+                # Ensure plot is a string and only scan it when it contains a tag
+                if isinstance(plot, str) and '<img' in plot:
                     # Try to extract image URLs from HTML img tags
-                    img_matches = re.findall(r'<img[^>]+src=[\'"]([^\'"]+)[\'"]', plot)
+                    img_matches = _IMG_SRC_RE.findall(plot)
                     if img_matches:
                         if not poster_url:
                             poster_url = img_matches[0]
                         if len(img_matches) > 1 and not backdrop_url:
                             backdrop_url = img_matches[1]
             
-            # For TMDB data, construct full URLs if needed
-            if poster_url and isinstance(poster_url, str):
-                if poster_url.startswith('/') and not poster_url.startswith('//'):
-                    poster_url = f"https://image.tmdb.org/t/p/w500{poster_url}"
+            # For TMDB data, construct full URLs if needed (paths start with a
+            # single slash, protocol-relative URLs with two)
+            if isinstance(poster_url, str) and poster_url[:1] == '/' and poster_url[:2] != '//':
+                poster_url = _TMDB_POSTER_BASE + poster_url
                 
-            if backdrop_url and isinstance(backdrop_url, str):
-                if backdrop_url.startswith('/') and not backdrop_url.startswith('//'):
-                    backdrop_url = f"https://image.tmdb.org/t/p/original{backdrop_url}"
+            if isinstance(backdrop_url, str) and backdrop_url[:1] == '/' and backdrop_url[:2] != '//':
+                backdrop_url = _TMDB_BACKDROP_BASE + backdrop_url
         
         except Exception as e:
             logger.error(f"Error extracting image URLs: {str(e)}")
@@ -138,7 +292,16 @@ class ArtworkManager(QObject):
             bool: True if artwork was found and updated
         """
         try:
-            poster_url, backdrop_url = self.extract_image_url(item, content_type)
+            # Items shown here may have had their detailed info merged in, so
+            # extract afresh and replace whatever was cached for the item
+            poster_url, backdrop_url = self._extract_image_url(item, content_type)
+            key = self._url_cache_key(item, content_type)
+            if key is not None:
+                self._store_urls(key, (poster_url, backdrop_url))
+            
+            # Downloads still pending for the previous item shouldn't land here
+            panel_id = id(info_panel)
+            self._unregister_panel(panel_id)
             
             if not poster_url and not backdrop_url:
                 logger.info(f"No artwork found for {content_type} item: {item.get('name', item.get('title', 'Unknown'))}")
@@ -147,12 +310,15 @@ class ArtworkManager(QObject):
             logger.info(f"Found artwork for {content_type}: poster={poster_url}, backdrop={backdrop_url}")
             
             # Register this panel with these URLs
-            panel_id = id(info_panel)
             self.active_panels[panel_id] = {
-                'panel': info_panel,
+                'panel': weakref.ref(info_panel),
                 'poster_url': poster_url,
                 'backdrop_url': backdrop_url
             }
+            if poster_url:
+                self._url_to_targets.setdefault(poster_url, set()).add((panel_id, 'poster'))
+            if backdrop_url:
+                self._url_to_targets.setdefault(backdrop_url, set()).add((panel_id, 'backdrop'))
             
             # Load images (from cache or start download)
             if poster_url and hasattr(info_panel, 'set_poster'):
@@ -168,44 +334,75 @@ class ArtworkManager(QObject):
             logger.error(f"Error updating artwork: {str(e)}")
             return False
     
-    @pyqtSlot(str, QPixmap)
-    def _on_image_loaded(self, url, pixmap):
+    def _unregister_panel(self, panel_id):
+        """Stop routing downloaded images to a panel"""
+        data = self.active_panels.pop(panel_id, None)
+        if not data:
+            return
+        
+        for url, kind in ((data['poster_url'], 'poster'), (data['backdrop_url'], 'backdrop')):
+            targets = self._url_to_targets.get(url)
+            if targets is None:
+                continue
+            targets.discard((panel_id, kind))
+            if not targets:
+                del self._url_to_targets[url]
+    
+    @pyqtSlot(str, str)
+    def _on_image_loaded(self, url, path):
         """
         Handle when an image has been loaded/downloaded
         
         Args:
             url: The URL of the image that was loaded
-            pixmap: The QPixmap of the loaded image
+            path: The cache file the image was saved to
         """
         try:
-            # Update all panels that were waiting for this URL
-            for panel_id, data in list(self.active_panels.items()):
-                panel = data['panel']
+            # Only panels that were waiting for this URL need updating
+            targets = self._url_to_targets.pop(url, None)
+            if not targets:
+                return
+            
+            # Decode and resize once per display size, in the background
+            for kind, (width, height) in self._ARTWORK_SIZES.items():
+                panel_ids = [panel_id for panel_id, target_kind in targets if target_kind == kind]
+                if not panel_ids:
+                    continue
+                worker = ScaleWorker(path, width, height)
+                worker.signals.finished.connect(
+                    lambda image, kind=kind, panel_ids=panel_ids: self._on_image_scaled(url, path, kind, panel_ids, image)
+                )
+                QThreadPool.globalInstance().start(worker)
+        except Exception as e:
+            logger.error(f"Error handling loaded image: {str(e)}")
+    
+    def _on_image_scaled(self, url, path, kind, panel_ids, image):
+        """Show scaled artwork on the panels that are still waiting for it"""
+        try:
+            if image.isNull():
+                logger.warning(f"Could not load cached image: {path}")
+                return
+            
+            pixmap = None
+            for panel_id in panel_ids:
+                data = self.active_panels.get(panel_id)
+                panel = data['panel']() if data else None
                 
                 # Check if this panel still exists
-                if not panel:
-                    del self.active_panels[panel_id]
+                if panel is None:
+                    self.active_panels.pop(panel_id, None)
                     continue
-                    
-                # Check which URL matched
-                if url == data['poster_url'] and hasattr(panel, 'set_poster'):
-                    # Resize for poster display
-                    if pixmap.height() > 450 or pixmap.width() > 300:
-                        pixmap = pixmap.scaled(
-                            300, 450, 
-                            aspectRatioMode=Qt.KeepAspectRatio,
-                            transformMode=Qt.SmoothTransformation
-                        )
+                
+                # Skip panels that moved on to another item while scaling
+                if data[f'{kind}_url'] != url:
+                    continue
+                
+                if pixmap is None:
+                    pixmap = QPixmap.fromImage(image)
+                
+                if kind == 'poster' and hasattr(panel, 'set_poster'):
                     panel.set_poster(pixmap)
-                    
-                elif url == data['backdrop_url'] and hasattr(panel, 'set_backdrop'):
-                    # Resize for backdrop display
-                    if pixmap.height() > 450 or pixmap.width() > 800:
-                        pixmap = pixmap.scaled(
-                            800, 450, 
-                            aspectRatioMode=Qt.KeepAspectRatio,
-                            transformMode=Qt.SmoothTransformation
-                        )
+                elif kind == 'backdrop' and hasattr(panel, 'set_backdrop'):
                     panel.set_backdrop(pixmap)
         except Exception as e:
-            logger.error(f"Error handling loaded image: {str(e)}")
\ No newline at end of file
+            logger.error(f"Error showing scaled image: {str(e)}")
\ No newline at end of file
@@ -10,8 +10,15 @@ Manages authentication for ChumpStreams
 import json
 import os
 import logging
+import tempfile
+import threading
 from PyQt5.QtCore import QObject, pyqtSignal
 
+try:
+    import orjson  # Optional, faster config parsing and writing
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger('chumpstreams')
 
 class AuthenticationManager(QObject):
@@ -21,6 +28,9 @@ class AuthenticationManager(QObject):
     login_succeeded = pyqtSignal(str)  # username
     login_failed = pyqtSignal(str)  # error message
     
+    # Carries a finished login attempt back to the thread the manager lives in
+    _login_finished = pyqtSignal(object)
+    
     def __init__(self, api, config_file):
         """Initialize authentication manager"""
         super().__init__()
@@ -29,43 +39,94 @@ class AuthenticationManager(QObject):
         self.auth = {}
         self.saved_credentials = {}
         self.current_service = None
+        
+        # Parsed config file, reused until the file changes on disk. The file
+        # is shared with the favorites and settings managers, so it's keyed
+        # by modification time and size rather than trusted indefinitely.
+        self._config_cache = None
+        self._config_signature = None
+        
+        # Only the most recent login attempt counts, and only one talks to
+        # the API at a time
+        self._login_generation = 0
+        self._login_lock = threading.Lock()
+        self._login_finished.connect(self._on_login_finished)
     
     def login(self, username, password, remember=False, service=None):
         """Attempt to login"""
-        try:
-            # Update API with service configuration if provided
-            if service:
-                self.current_service = service
-                self.api.base_url = self._build_base_url(service)
-                logger.info(f"Using service: {service['name']} at {self.api.base_url}")
-            
-            # Login using API
-            result = self.api.login(username, password)
+        self._login_generation += 1
+        self._run_login(self._login_generation, username, password, remember, service)
+    
+    def login_async(self, username, password, remember=False, service=None):
+        """Attempt to login in a background thread, reporting back through the login signals"""
+        # A newer attempt supersedes any that are still running
+        self._login_generation += 1
+        thread = threading.Thread(
+            target=self._run_login,
+            args=(self._login_generation, username, password, remember, service)
+        )
+        thread.daemon = True
+        thread.start()
+    
+    def _run_login(self, generation, username, password, remember, service):
+        """Log in to the API, then hand the outcome to _on_login_finished"""
+        result = None
+        error = None
+        with self._login_lock:
+            # Don't start a request for an attempt that was already superseded
+            if generation != self._login_generation:
+                return
             
-            if result:
-                # Store auth info
-                self.auth = {
-                    'username': username,
-                    'password': password,
-                    'user_info': result.get('user_info', {}),
-                    'service': self.current_service
-                }
-                
-                # Save credentials if requested
-                if remember:
-                    self.save_credentials(username, password, self.current_service)
-                else:
-                    # Clear saved credentials for this service
-                    self.clear_saved_credentials(self.current_service)
+            try:
+                # Update API with service configuration if provided
+                if service:
+                    self.api.base_url = self._build_base_url(service)
+                    logger.info(f"Using service: {service['name']} at {self.api.base_url}")
                 
-                # Emit success signal
-                self.login_succeeded.emit(username)
-            else:
-                # Emit failure signal
-                self.login_failed.emit("Invalid username or password")
-        except Exception as e:
-            logger.error(f"Login error: {str(e)}")
-            self.login_failed.emit(f"Login error: {str(e)}")
+                # Login using API
+                result = self.api.login(username, password)
+                if not result:
+                    error = "Invalid username or password"
+            except Exception as e:
+                logger.error(f"Login error: {str(e)}")
+                error = f"Login error: {str(e)}"
+        
+        # Credentials are saved to the config file shared with the other
+        # managers, so finish the login on their thread
+        self._login_finished.emit((generation, username, password, remember, service, result, error))
+    
+    def _on_login_finished(self, outcome):
+        """Store the result of a login attempt and report it"""
+        generation, username, password, remember, service, result, error = outcome
+        if generation != self._login_generation:
+            logger.info(f"Ignoring superseded login for {username}")
+            return
+        
+        if error:
+            # Emit failure signal
+            self.login_failed.emit(error)
+            return
+        
+        if service:
+            self.current_service = service
+        
+        # Store auth info
+        self.auth = {
+            'username': username,
+            'password': password,
+            'user_info': result.get('user_info', {}),
+            'service': self.current_service
+        }
+        
+        # Save credentials if requested
+        if remember:
+            self.save_credentials(username, password, self.current_service)
+        else:
+            # Clear saved credentials for this service
+            self.clear_saved_credentials(self.current_service)
+        
+        # Emit success signal
+        self.login_succeeded.emit(username)
     
     def _build_base_url(self, service):
         """Build base URL from service configuration"""
@@ -88,14 +149,58 @@ class AuthenticationManager(QObject):
         """Check if user is logged in"""
         return bool(self.auth)
     
+    def _file_signature(self):
+        """Get the config file's modification time and size, or None if it doesn't exist"""
+        try:
+            stat = os.stat(self.config_file)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _read_config(self):
+        """Read the config file, reusing the parsed copy if it hasn't changed"""
+        signature = self._file_signature()
+        if signature is None:
+            return {}
+        
+        if self._config_cache is None or signature != self._config_signature:
+            with open(self.config_file, 'rb') as f:
+                data = f.read()
+            self._config_cache = orjson.loads(data) if orjson is not None else json.loads(data)
+            self._config_signature = signature
+        return self._config_cache
+    
+    def _write_config(self, config):
+        """Write the config file atomically"""
+        # Whatever happens, the cached copy may no longer match the file
+        self._config_cache = None
+        
+        os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
+        
+        # Write to a temporary file first so a crash can't leave a
+        # truncated config behind
+        if orjson is not None:
+            data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(config, indent=2).encode('utf-8')
+        fd, temp_file = tempfile.mkstemp(dir=os.path.dirname(self.config_file), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_file, self.config_file)
+        except Exception:
+            # Don't leave a partial temporary file behind
+            os.remove(temp_file)
+            raise
+        
+        self._config_cache = config
+        self._config_signature = self._file_signature()
+    
     def save_credentials(self, username, password, service=None):
         """Save credentials to config file"""
         try:
             # Load existing config
-            config = {}
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
+            config = self._read_config()
             
             # Update credentials section
             if 'credentials' not in config:
@@ -114,9 +219,7 @@ class AuthenticationManager(QObject):
             config['last_service'] = service_key
             
             # Save config
-            os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=2)
+            self._write_config(config)
                 
             logger.info(f"Saved credentials for {username} on {service_key}")
         except Exception as e:
@@ -125,11 +228,9 @@ class AuthenticationManager(QObject):
     def load_saved_credentials(self):
         """Load saved credentials from config file"""
         try:
-            if not os.path.exists(self.config_file):
+            config = self._read_config()
+            if not config:
                 return
-                
-            with open(self.config_file, 'r') as f:
-                config = json.load(f)
             
             # Get last used service
             last_service = config.get('last_service', 'default')
@@ -158,25 +259,28 @@ class AuthenticationManager(QObject):
     def clear_saved_credentials(self, service=None):
         """Clear saved credentials"""
         try:
-            if not os.path.exists(self.config_file):
+            config = self._read_config()
+            if not config:
                 return
-                
-            with open(self.config_file, 'r') as f:
-                config = json.load(f)
             
-            if 'credentials' in config:
+            # Only rewrite the file if there was something to clear, as this
+            # runs on every login that doesn't remember the credentials
+            changed = False
+            if config.get('credentials'):
                 if service:
                     # Clear specific service
                     service_key = service['name'] if isinstance(service, dict) else service
                     if service_key in config['credentials']:
                         del config['credentials'][service_key]
+                        changed = True
                 else:
                     # Clear all credentials
                     config['credentials'] = {}
+                    changed = True
             
             # Save config
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=2)
+            if changed:
+                self._write_config(config)
                 
             # Clear in-memory credentials
             if not service or (service and self.saved_credentials.get('service_name') == (service['name'] if isinstance(service, dict) else service)):
@@ -23,6 +23,9 @@ DEFAULT_CATEGORIES = {
     "series": "Top 30 IMDB"
 }
 
+# How long cached categories are used before reloading them from the server (seconds)
+CATEGORY_CACHE_TTL = 6 * 60 * 60
+
 # Paths
 APPDATA = os.getenv("APPDATA") or os.path.expanduser("~")
 CFG_DIR = os.path.join(APPDATA, "ChumpStreams")
@@ -10,7 +10,8 @@ Handles content loading and processing for ChumpStreams
 import logging
 import time
 import base64
-from PyQt5.QtCore import QObject, pyqtSignal, QRunnable, QThreadPool, pyqtSlot
+from collections import OrderedDict
+from PyQt5.QtCore import QObject, pyqtSignal, QRunnable, QThreadPool, QTimer, pyqtSlot
 
 logger = logging.getLogger('chumpstreams')
 
@@ -55,6 +56,10 @@ class ContentWorker(QRunnable):
         """Process items before returning"""
         # This could include decoding names, adding additional metadata, etc.
         for item in items:
+            # Items served from the API client's cache were already processed
+            if item.get('content_type') == content_type:
+                continue
+                
             if 'name' in item:
                 item['name'] = self._safe_b64decode(item['name'])
             elif 'title' in item:
@@ -221,6 +226,30 @@ class InfoWorker(QRunnable):
             return s
 
 
+class CategoryWorker(QRunnable):
+    """Worker for loading the categories of all content types in background"""
+    
+    class Signals(QObject):
+        """Signals for CategoryWorker"""
+        finished = pyqtSignal(object)
+        error = pyqtSignal(str)
+    
+    def __init__(self, api):
+        super().__init__()
+        self.api = api
+        self.signals = self.Signals()
+    
+    @pyqtSlot()
+    def run(self):
+        """Run category loading task"""
+        try:
+            categories = self.api.get_all_categories()
+            self.signals.finished.emit(categories)
+        except Exception as e:
+            logger.error(f"Error loading categories: {str(e)}")
+            self.signals.error.emit(str(e))
+
+
 class ContentManager:
     """Manages content loading and processing"""
     
@@ -228,6 +257,29 @@ class ContentManager:
         self.api = api
         self.thread_pool = QThreadPool()
         logger.info(f"Using thread pool with maximum {self.thread_pool.maxThreadCount()} threads")
+        
+        # Info requests are held briefly so that rapid selection changes
+        # (e.g. holding an arrow key) only load the item the user lands on
+        self._pending_info = None
+        self._pending_prefetch = None
+        self._info_in_flight = {}  # (content_type, item_id) -> [(callback, error_callback)]
+        self._info_timer = QTimer()
+        self._info_timer.setSingleShot(True)
+        self._info_timer.setInterval(50)
+        self._info_timer.timeout.connect(self._flush_info_request)
+        
+        # Recently loaded movie and series info, so going back to an item
+        # doesn't need another round trip through the worker pool
+        self._info_cache = OrderedDict()  # (content_type, item_id) -> (timestamp, info)
+        self.info_cache_size = 512
+        self.info_cache_duration = 600
+    
+    def load_categories(self, callback, error_callback):
+        """Load categories for all content types in background thread"""
+        worker = CategoryWorker(self.api)
+        worker.signals.finished.connect(callback)
+        worker.signals.error.connect(error_callback)
+        self.thread_pool.start(worker)
     
     def load_content(self, auth, content_type, category_id, callback, error_callback):
         """Load content in background thread"""
@@ -237,11 +289,89 @@ class ContentManager:
         self.thread_pool.start(worker)
     
     def load_info(self, auth, content_type, item_id, callback, error_callback):
-        """Load content info in background thread"""
+        """
+        Load content info in background thread
+        
+        Info is only loaded for the info panel, so a request replaces any
+        that hasn't started within the last 50 ms. Requests for an item
+        that is already loading share that load.
+        """
+        self._pending_info = (auth, content_type, item_id, callback, error_callback)
+        self._info_timer.start()
+    
+    def prefetch_info(self, auth, content_type, item_ids):
+        """
+        Load info for items the user is likely to select next into the cache
+        
+        Like load_info, this waits for selection to settle, and only the
+        most recent set of items is loaded.
+        """
+        self._pending_prefetch = (auth, content_type, item_ids)
+        self._info_timer.start()
+    
+    def _flush_info_request(self):
+        """Start loading the most recent info request and prefetches"""
+        if self._pending_info:
+            auth, content_type, item_id, callback, error_callback = self._pending_info
+            self._pending_info = None
+            
+            key = (content_type, item_id)
+            entry = self._cached_info(key)
+            if entry:
+                callback(entry[1])
+            elif key in self._info_in_flight:
+                self._info_in_flight[key].append((callback, error_callback))
+            else:
+                self._info_in_flight[key] = [(callback, error_callback)]
+                self._start_info_worker(auth, key)
+        
+        if self._pending_prefetch:
+            auth, content_type, item_ids = self._pending_prefetch
+            self._pending_prefetch = None
+            
+            for item_id in item_ids:
+                key = (content_type, item_id)
+                if self._cached_info(key) or key in self._info_in_flight:
+                    continue
+                # Nothing waits on a prefetch, it only fills the cache
+                self._info_in_flight[key] = []
+                self._start_info_worker(auth, key, priority=-1)
+    
+    def _cached_info(self, key):
+        """Get a fresh (timestamp, info) cache entry, or None"""
+        entry = self._info_cache.get(key)
+        if entry and time.time() - entry[0] < self.info_cache_duration:
+            self._info_cache.move_to_end(key)
+            return entry
+        return None
+    
+    def _start_info_worker(self, auth, key, priority=0):
+        """Start a worker loading info for a (content_type, item_id) key"""
+        content_type, item_id = key
         worker = InfoWorker(self.api, auth, content_type, item_id)
-        worker.signals.finished.connect(callback)
-        worker.signals.error.connect(error_callback)
-        self.thread_pool.start(worker)
+        worker.signals.finished.connect(lambda result: self._on_info_finished(key, result))
+        worker.signals.error.connect(lambda error: self._on_info_failed(key, error))
+        self.thread_pool.start(worker, priority)
+    
+    def _on_info_finished(self, key, result):
+        """Pass loaded info to every request waiting on it"""
+        if key[0] in ('vod', 'series') and result:
+            self._info_cache[key] = (time.time(), result)
+            self._info_cache.move_to_end(key)
+            if len(self._info_cache) > self.info_cache_size:
+                self._info_cache.popitem(last=False)
+        
+        for callback, _ in self._info_in_flight.pop(key, []):
+            callback(result)
+    
+    def _on_info_failed(self, key, error):
+        """Pass an info loading error to every request waiting on it"""
+        for _, error_callback in self._info_in_flight.pop(key, []):
+            error_callback(error)
+    
+    def clear_info_cache(self):
+        """Drop cached info, e.g. when switching to another service"""
+        self._info_cache.clear()
     
     def extract_stream_url(self, api, auth, item, content_type):
         """Extract stream URL from item based on content type"""
@@ -9,8 +9,7 @@ Handles content loading, display, and interaction for ChumpStreams
 """
 import logging
 import traceback
-from PyQt5.QtCore import QObject, Qt
-from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QObject
 
 logger = logging.getLogger('chumpstreams')
 
@@ -62,11 +61,7 @@ class ContentHandler(QObject):
         logger.info(f"Updating UI with {len(category_names)} {content_type} categories")
         
         # Update category list in UI
-        self.window.category_panel.categories_list.clear()
-        self.window.category_panel.categories_list.addItems(category_names)
-        
-        # Process events to ensure UI updates
-        QApplication.processEvents()
+        self.window.category_panel.set_categories(category_names)
         
         # Log actual count
         after_count = self.window.category_panel.categories_list.count()
@@ -79,31 +74,28 @@ class ContentHandler(QObject):
             default = DEFAULT_CATEGORIES.get(content_type, '')
             logger.info(f"Looking for default category: {default}")
             
-            # Try to find exact match first
+            # Prefer the configured default, then a UK entertainment
+            # category, then just the first one
             if default in category_names:
                 category_name = default
                 logger.info(f"Found exact match for default category: {category_name}")
             else:
-                # Try to find partial match
-                for name in category_names:
-                    if "uk" in name.lower() and "entertainment" in name.lower():
-                        category_name = name
-                        logger.info(f"Found partial match for default category: {category_name}")
-                        break
-                        
-                # If still no match, use first category
-                if not 'category_name' in locals() and category_names:
+                category_name = next(
+                    (name for name in category_names
+                     if "uk" in name.lower() and "entertainment" in name.lower()),
+                    None
+                )
+                if category_name:
+                    logger.info(f"Found partial match for default category: {category_name}")
+                else:
                     category_name = category_names[0]
                     logger.info(f"Using first category as default: {category_name}")
             
             # Select the category in the UI
-            if 'category_name' in locals():
-                logger.info(f"Selecting default category: {category_name}")
-                items = self.window.category_panel.categories_list.findItems(category_name, Qt.MatchExactly)
-                if items:
-                    self.window.category_panel.categories_list.setCurrentItem(items[0])
-                    # Load content for the default category
-                    self._load_content_for_category(content_type, category_name)
+            logger.info(f"Selecting default category: {category_name}")
+            self.window.category_panel.categories_list.setCurrentRow(category_names.index(category_name))
+            # Load content for the default category
+            self._load_content_for_category(content_type, category_name)
 
     def on_category_changed(self, content_type, category_name):
         """Handle category change"""
@@ -126,7 +118,7 @@ class ContentHandler(QObject):
         # update the categories for that type
         if not category_name:
             from PyQt5.QtCore import QTimer
-            QTimer.singleShot(100, lambda: self.update_categories_for_type(content_type))
+            QTimer.singleShot(0, lambda: self.update_categories_for_type(content_type))
             return
         
         # Load content for the specified category
@@ -567,13 +559,10 @@ class ContentHandler(QObject):
                     removed_item = favorites[current_index]
                     logger.info(f"Removing favorite at index {current_index}: {removed_item.get('label')}")
                     
-                    # First remove from favorites manager, then update local list
+                    # First remove from favorites manager, then update local list.
+                    # The manager saves the change to file shortly afterwards.
                     self.favorites_manager.remove_favorite_by_index(current_index)
                     
-                    # Force save to file
-                    self.favorites_manager._save_favorites()
-                    logger.info("Saved favorites to file")
-                    
                     # Refresh favorites view
                     self._display_favorites()
                     self.window.show_info_message("Favorites", "Removed from favorites")
@@ -597,12 +586,9 @@ class ContentHandler(QObject):
                 stream_id = item.get('stream_id')
                 logger.info(f"Toggling Live favorite, stream_id: {stream_id}, name: {item.get('name', 'Unknown')}")
             
-            # Toggle favorite status
+            # Toggle favorite status; the manager saves the change to file shortly afterwards
             is_favorite = self.favorites_manager.toggle_favorite(item, content_type)
-            
-            # Force save to file
-            self.favorites_manager._save_favorites()
-            logger.info(f"Saved favorites after toggle, is now favorite: {is_favorite}")
+            logger.info(f"Toggled favorite, is now favorite: {is_favorite}")
             
             # Show message
             action = "Added to" if is_favorite else "Removed from"
@@ -652,12 +638,9 @@ class ContentHandler(QObject):
             return
         
         try:    
-            # Toggle favorite status
+            # Toggle favorite status; the manager saves the change to file shortly afterwards
             is_favorite = self.favorites_manager.toggle_series_favorite(series)
-            
-            # Force save to file
-            self.favorites_manager._save_favorites()
-            logger.info(f"Saved favorites after series toggle, is now favorite: {is_favorite}")
+            logger.info(f"Toggled series favorite, is now favorite: {is_favorite}")
             
             # Update series info to reflect favorite status
             series['is_favorite'] = is_favorite
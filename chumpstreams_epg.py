@@ -29,16 +29,15 @@ def get_channel_mapping_path():
 class EPGManager:
     """Manager for handling Electronic Program Guide data, with channel mapping override"""
 
-    def __init__(self, base_url, use_https=True):
+    def __init__(self, base_url, use_https=True, session=None):
         """Initialize EPG Manager"""
-        # Ensure base_url doesn't include protocol
-        if base_url.startswith('http://') or base_url.startswith('https://'):
-            base_url = base_url.split('://')[-1]
-
-        protocol = 'https' if use_https else 'http'
-        self.base_url = f"{protocol}://{base_url}"
+        self.set_base_url(base_url, use_https)
         logger.info(f"EPG Manager initialized with base URL: {self.base_url}")
 
+        # Share the API client's session when given, so EPG downloads reuse
+        # its keep-alive connections to the same server
+        self.session = session if session is not None else requests.Session()
+
         self.epg_cache = {}
         self.epg_cache_time = 0
         self.epg_cache_duration = 3600  # In-memory cache for 1 hour
@@ -46,6 +45,12 @@ class EPGManager:
         self.channels = {}
         self.programs = {}
 
+        # Memoized lookups, dropped whenever the EPG data or mappings change
+        self._mapping_cache = {}  # stream name -> EPG channel ID (or None)
+        self._program_cache = {}  # (kind, EPG channel ID, hours) -> (timestamp, result)
+        self.program_cache_duration = 60  # Current/next programs move on, so keep briefly
+        self._lookup_cache_sources = None
+
         # Set up cache file path
         self.cache_dir = self._get_cache_dir()
         self.cache_file = os.path.join(self.cache_dir, "epg_cache.json")
@@ -54,6 +59,15 @@ class EPGManager:
         # Load channel mapping override
         self._load_channel_mappings()
 
+    def set_base_url(self, base_url, use_https=True):
+        """Set the server EPG data is fetched from"""
+        # Ensure base_url doesn't include protocol
+        if base_url.startswith('http://') or base_url.startswith('https://'):
+            base_url = base_url.split('://')[-1]
+
+        protocol = 'https' if use_https else 'http'
+        self.base_url = f"{protocol}://{base_url}"
+
     def _get_cache_dir(self):
         """Get cache directory path"""
         # Use the same config directory as the main application
@@ -148,7 +162,7 @@ class EPGManager:
 
         try:
             logger.info(f"Fetching XMLTV EPG data from {url}...")
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params)
 
             if response.status_code != 200:
                 logger.error(f"XMLTV EPG request failed with status code: {response.status_code}")
@@ -358,12 +372,48 @@ class EPGManager:
         """Public method to reload channel mappings at runtime"""
         self._load_channel_mappings()
 
+    def _check_lookup_caches(self):
+        """Drop memoized lookups if the EPG data or channel mappings were replaced"""
+        sources = (self.channels, self.programs, getattr(self, 'channel_mappings', None))
+        cached_sources = self._lookup_cache_sources
+        if cached_sources is None or any(a is not b for a, b in zip(sources, cached_sources)):
+            self._mapping_cache = {}
+            self._program_cache = {}
+            self._lookup_cache_sources = sources
+
+    def _cached_program_lookup(self, key, compute):
+        """Return a recent result for a program lookup, computing it if needed"""
+        self._check_lookup_caches()
+        now = time.time()
+        entry = self._program_cache.get(key)
+        if entry and now - entry[0] < self.program_cache_duration:
+            return entry[1]
+
+        result = compute()
+        self._program_cache[key] = (now, result)
+        return result
+
     def map_stream_to_epg(self, stream_name):
-        """Map a stream name to an EPG channel ID with custom mapping (if available)"""
+        """Map a stream name to an EPG channel ID, memoizing the result"""
         if not stream_name:
             logger.debug(f"Cannot map empty stream name to EPG")
             return None
 
+        self._check_lookup_caches()
+        mapping_cache = self._mapping_cache
+        if stream_name in mapping_cache:
+            return mapping_cache[stream_name]
+
+        # Store into the cache the lookup started with. If the EPG data or
+        # mappings were replaced meanwhile (e.g. by a background pre-mapping
+        # thread), that cache has been dropped and the result goes with it.
+        epg_channel_id = self._map_stream_to_epg(stream_name)
+        mapping_cache[stream_name] = epg_channel_id
+        return epg_channel_id
+
+    def _map_stream_to_epg(self, stream_name):
+        """Map a stream name to an EPG channel ID with custom mapping (if available)"""
+
         # 1. Try the user-provided mapping first
         mapping = getattr(self, 'channel_mappings', {})
         if mapping and stream_name in mapping:
@@ -439,6 +489,13 @@ class EPGManager:
         if not epg_channel_id:
             return None
 
+        return self._cached_program_lookup(
+            ('current', epg_channel_id, 1),
+            lambda: self._find_current_program(epg_channel_id)
+        )
+
+    def _find_current_program(self, epg_channel_id):
+        """Find the currently airing program for a channel"""
         programs = self.get_channel_epg(epg_channel_id, hours=1)
         if not programs:
             return None
@@ -457,6 +514,13 @@ class EPGManager:
         if not epg_channel_id:
             return None
 
+        return self._cached_program_lookup(
+            ('next', epg_channel_id, 12),
+            lambda: self._find_next_program(epg_channel_id)
+        )
+
+    def _find_next_program(self, epg_channel_id):
+        """Find the next program for a channel"""
         programs = self.get_channel_epg(epg_channel_id, hours=12)
         if not programs:
             return None
@@ -483,6 +547,13 @@ class EPGManager:
 
     def get_formatted_epg_for_channel(self, epg_channel_id, hours=12):
         """Get formatted EPG data for a channel suitable for UI display"""
+        return self._cached_program_lookup(
+            ('formatted', epg_channel_id, hours),
+            lambda: self._format_epg_for_channel(epg_channel_id, hours)
+        )
+
+    def _format_epg_for_channel(self, epg_channel_id, hours):
+        """Format EPG data for a channel for UI display"""
         programs = self.get_channel_epg(epg_channel_id, hours)
 
         formatted_programs = []
@@ -499,6 +570,33 @@ class EPGManager:
 
         return formatted_programs
 
+    def get_formatted_now_next(self, epg_channel_id):
+        """Get the current and next programs for a channel formatted for UI display"""
+        if not epg_channel_id:
+            return None, None
+
+        return self._cached_program_lookup(
+            ('now_next', epg_channel_id, 12),
+            lambda: (self._format_program(self.get_current_program(epg_channel_id)),
+                     self._format_program(self.get_next_program(epg_channel_id)))
+        )
+
+    def _format_program(self, program):
+        """Format a single program for the info panel, or None if there isn't one"""
+        if not program:
+            return None
+
+        return {
+            'title': program.get('title', 'Unknown'),
+            'start_time': self.format_epg_time(program.get('start_timestamp')),
+            'end_time': self.format_epg_time(program.get('stop_timestamp')),
+            'description': program.get('description', ''),
+            'duration': self._format_duration(
+                program.get('start_timestamp'),
+                program.get('stop_timestamp')
+            )
+        }
+
     def _format_duration(self, start_timestamp, stop_timestamp):
         """Format the duration of a program"""
         if not start_timestamp or not stop_timestamp:
@@ -536,12 +634,12 @@ class EPGManager:
         self.programs = {}
 
         # Delete cache file
-        if os.path.exists(self.cache_file):
-            try:
-                os.remove(self.cache_file)
-                logger.info("EPG cache file deleted")
-                return True
-            except Exception as e:
-                logger.error(f"Failed to delete EPG cache file: {str(e)}")
-                return False
+        try:
+            os.remove(self.cache_file)
+            logger.info("EPG cache file deleted")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Failed to delete EPG cache file: {str(e)}")
+            return False
         return True
@@ -9,7 +9,7 @@ Manages EPG functionality for ChumpStreams
 """
 import logging
 import threading
-from PyQt5.QtCore import QObject, pyqtSignal, QTimer
+from PyQt5.QtCore import QObject, pyqtSignal
 
 logger = logging.getLogger('chumpstreams')
 
@@ -50,14 +50,16 @@ class EPGManager(QObject):
             channel_count = len(epg_data.get('channels', {}))
             status_message = f"EPG data loaded for {channel_count} channels"
             
-            # Update UI via main thread
-            QTimer.singleShot(0, lambda: self.epg_loaded.emit(status_message))
+            # Update UI via main thread - signals emitted from this thread are
+            # queued to the receivers' thread. A QTimer can't be used here as
+            # this thread has no Qt event loop to run it.
+            self.epg_loaded.emit(status_message)
             
             logger.info(f"EPG data fetched successfully: {channel_count} channels")
         except Exception as e:
             logger.error(f"Error fetching EPG data: {str(e)}")
             # Update UI to show error
-            QTimer.singleShot(0, lambda: self.epg_error.emit("EPG data loading failed"))
+            self.epg_error.emit("EPG data loading failed")
 
     def clear_cache(self):
         """Clear the EPG cache"""
@@ -8,9 +8,11 @@ Last updated: 2025-05-26 14:55:27
 Manager for handling favorites
 """
 import os
+import tempfile
 import json
 import logging
 from copy import deepcopy
+from PyQt5.QtCore import QTimer
 
 logger = logging.getLogger('chumpstreams')
 
@@ -22,6 +24,11 @@ class FavoritesManager:
         self.config_file = config_file
         self.favorites = []
         self.api = None  # Will be set by main app
+        self._index = {}  # (type group, ID) -> favorite, for constant time lookups
+        
+        # Saves after adding or removing favorites are delayed slightly and
+        # combined, since each one rewrites the whole config file
+        self._save_timer = None
         
         # Load favorites from config if exists
         self._load_favorites()
@@ -38,12 +45,17 @@ class FavoritesManager:
                 
             if 'favorites' in config:
                 self.favorites = config['favorites']
+                self._rebuild_index()
                 logger.info(f"Loaded {len(self.favorites)} favorites from config")
         except Exception as e:
             logger.error(f"Error loading favorites: {e}")
     
     def _save_favorites(self):
         """Save favorites to config file"""
+        # Every change to the favorites list is saved, so keep the lookup
+        # index in step with it here
+        self._rebuild_index()
+        
         if not os.path.exists(self.config_file):
             # Create empty config
             config = {}
@@ -62,15 +74,47 @@ class FavoritesManager:
             # Create directory if it doesn't exist
             os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
             
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=2)
+            # Write to a temporary file first so a crash can't leave a
+            # truncated config behind
+            fd, temp_file = tempfile.mkstemp(dir=os.path.dirname(self.config_file), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(config, f, indent=2)
+                os.replace(temp_file, self.config_file)
+            except Exception:
+                # Don't leave a partial temporary file behind
+                os.remove(temp_file)
+                raise
                 
             logger.info(f"Saved {len(self.favorites)} favorites to config")
         except Exception as e:
             logger.error(f"Error saving favorites: {e}")
     
+    def _schedule_save(self):
+        """Save favorites to config file after a short delay"""
+        # Lookups must see the change straight away, even before it's saved
+        self._rebuild_index()
+        
+        if self._save_timer is None:
+            self._save_timer = QTimer()
+            self._save_timer.setSingleShot(True)
+            self._save_timer.timeout.connect(self._save_favorites)
+        if not self._save_timer.isActive():
+            self._save_timer.start(500)
+    
+    def flush_pending_save(self):
+        """Save favorites now if a delayed save is waiting"""
+        if self._save_timer is not None and self._save_timer.isActive():
+            self._save_timer.stop()
+            self._save_favorites()
+    
     def get_all_favorites(self):
-        """Get all favorites"""
+        """
+        Get all favorites
+        
+        Returns the manager's own list rather than a copy, so it is cheap to
+        call after every change but must be treated as read-only.
+        """
         return self.favorites
     
     def get_empty_favorites_message(self):
@@ -133,8 +177,8 @@ class FavoritesManager:
         # Add to favorites
         self.favorites.append(favorite)
         
-        # Save to file
-        self._save_favorites()
+        # Save to file shortly, so rapid toggles share one write
+        self._schedule_save()
         logger.info(f"Added to favorites: {favorite['label']} ({content_type})")
     
     def remove_favorite(self, item, content_type):
@@ -158,66 +202,65 @@ class FavoritesManager:
         # Remove from list
         self.favorites.pop(index)
         
-        # Save to file
-        self._save_favorites()
+        # Save to file shortly, so rapid toggles share one write
+        self._schedule_save()
         logger.info(f"Removed from favorites: {label} ({content_type})")
         return True
     
     def _find_favorite_index(self, item, content_type):
         """Find index of item in favorites"""
-        # For live and vod, search by stream_id/vod_id
-        if content_type in ['live', 'vod']:
-            item_id = item.get('stream_id', item.get('vod_id'))
-            if not item_id:
-                return -1
-                
-            for i, favorite in enumerate(self.favorites):
-                if favorite.get('type') != content_type:
-                    continue
-                    
-                fav_item = favorite.get('item', {})
-                fav_id = fav_item.get('stream_id', fav_item.get('vod_id'))
-                
-                if fav_id and fav_id == item_id:
-                    return i
+        favorite = self._find_favorite(item, content_type)
+        if favorite is None:
+            return -1
         
-        # For series, search by series_id
+        for i, fav in enumerate(self.favorites):
+            if fav is favorite:
+                return i
+        return -1
+    
+    def _find_favorite(self, item, content_type):
+        """Find the favorite entry matching an item, or None"""
+        item_id = self._favorite_id(item, content_type)
+        if not item_id:
+            return None
+        return self._index.get((self._favorite_group(content_type), item_id))
+    
+    def _favorite_id(self, item, content_type):
+        """Get the ID an item is matched on in favorites"""
+        if content_type in ['live', 'vod']:
+            return item.get('stream_id', item.get('vod_id'))
         elif content_type in ['series', 'full_series']:
-            series_id = item.get('series_id')
-            if not series_id:
-                return -1
-                
-            for i, favorite in enumerate(self.favorites):
-                if favorite.get('type') not in ['series', 'full_series']:
-                    continue
-                    
-                fav_item = favorite.get('item', {})
-                fav_id = fav_item.get('series_id')
-                
-                if fav_id and fav_id == series_id:
-                    return i
-        
-        # For episodes, search by id
+            return item.get('series_id')
         elif content_type == 'episode':
-            episode_id = item.get('id')
-            if not episode_id:
-                return -1
-                
-            for i, favorite in enumerate(self.favorites):
-                if favorite.get('type') != 'episode':
-                    continue
-                    
-                fav_item = favorite.get('item', {})
-                fav_id = fav_item.get('id')
-                
-                if fav_id and fav_id == episode_id:
-                    return i
-                
-        return -1
+            return item.get('id')
+        return None
+    
+    def _favorite_group(self, content_type):
+        """Get the group of favorite types an item of a content type is matched against"""
+        # Series can be saved as either 'series' or 'full_series'
+        if content_type in ['series', 'full_series']:
+            return 'series'
+        return content_type
+    
+    def _rebuild_index(self):
+        """Rebuild the lookup index from the favorites list"""
+        index = {}
+        for favorite in self.favorites:
+            content_type = favorite.get('type')
+            fav_id = self._favorite_id(favorite.get('item', {}), content_type)
+            if fav_id:
+                # Keep the first match, as a scan of the list would
+                index.setdefault((self._favorite_group(content_type), fav_id), favorite)
+        self._index = index
+    
+    def favorite_keys(self, content_type):
+        """Get the set of favorite IDs that items of a content type are matched against"""
+        group = self._favorite_group(content_type)
+        return {fav_id for fav_group, fav_id in self._index if fav_group == group}
     
     def is_favorite(self, item, content_type):
         """Check if an item is a favorite"""
-        return self._find_favorite_index(item, content_type) >= 0
+        return self._find_favorite(item, content_type) is not None
     
     def toggle_favorite(self, item, content_type):
         """Toggle favorite status of an item"""
@@ -248,8 +291,8 @@ class FavoritesManager:
         # Add to favorites
         self.favorites.append(favorite)
         
-        # Save to file
-        self._save_favorites()
+        # Save to file shortly, so rapid toggles share one write
+        self._schedule_save()
         logger.info(f"Added series to favorites: {favorite['label']}")
     
     def remove_series_favorite(self, series):
@@ -267,8 +310,8 @@ class FavoritesManager:
             # Remove from list
             self.favorites.pop(index)
             
-            # Save to file
-            self._save_favorites()
+            # Save to file shortly, so rapid toggles share one write
+            self._schedule_save()
             logger.info(f"Removed series from favorites: {label}")
             return True
         
@@ -276,8 +319,7 @@ class FavoritesManager:
     
     def is_series_favorite(self, series):
         """Check if a series is a favorite"""
-        return (self._find_favorite_index(series, 'full_series') >= 0 or
-                self._find_favorite_index(series, 'series') >= 0)
+        return self._find_favorite(series, 'full_series') is not None
     
     def toggle_series_favorite(self, series):
         """Toggle favorite status of a series"""
@@ -401,10 +443,13 @@ class FavoritesManager:
         if not items:
             return
             
-        # For each item, set its favorite status
+        # Collect the favorite IDs once, so each item is a set lookup
+        # rather than a scan of the favorites list
+        keys = self.favorite_keys(content_type)
+        favorite_id = self._favorite_id
         for item in items:
-            is_fav = self.is_favorite(item, content_type)
-            item['is_favorite'] = is_fav
+            item_id = favorite_id(item, content_type)
+            item['is_favorite'] = bool(item_id) and item_id in keys
     
     def debug_favorites(self):
         """Get debug information about favorites"""
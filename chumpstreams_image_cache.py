@@ -9,11 +9,13 @@ Handles downloading, caching, and retrieving of artwork images
 """
 import os
 import logging
-import urllib.request
 import urllib.parse
 import hashlib
+import tempfile
 import threading
-from PyQt5.QtGui import QPixmap, QImage, QColor
+import requests
+from requests.adapters import HTTPAdapter
+from PyQt5.QtGui import QPixmap, QImage, QImageReader, QColor
 from PyQt5.QtCore import QObject, pyqtSignal, Qt
 
 logger = logging.getLogger('chumpstreams')
@@ -22,11 +24,16 @@ class ImageCache(QObject):
     """
     Image cache manager for downloading, storing and retrieving artwork
     
+    Images are streamed straight to disk and only decoded into pixmaps on
+    the GUI thread when they are displayed. The cache directory is kept to
+    a byte budget by evicting the least recently used files.
+    
     Signals:
-        image_loaded(str, QPixmap): Emitted when an image has been loaded
+        image_loaded(str, str): Emitted with the URL and cache file path when
+            an image has been downloaded
     """
     
-    image_loaded = pyqtSignal(str, QPixmap)
+    image_loaded = pyqtSignal(str, str)
     
     def __init__(self, cache_dir):
         """
@@ -41,6 +48,24 @@ class ImageCache(QObject):
         self.default_poster = None
         self.default_backdrop = None
         self._loading = {}  # Track URLs in progress to avoid duplicate requests
+        self._loading_lock = threading.Lock()  # Prefetch workers and the UI thread both claim URLs
+        
+        # Disk budget, enforced after downloads by evicting least recently used files
+        self.max_cache_bytes = 500 * 1024 * 1024
+        self._cache_bytes = None  # Running total, measured on the first download
+        self._size_lock = threading.Lock()
+        
+        # Artwork mostly comes from a few image hosts, so download through a
+        # pooled session that keeps connections alive between images
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        # Add a user agent to avoid 403 errors from some hosts
+        self._session.headers.update({
+            'User-Agent': 'Mozilla/5.0 ChumpStreams/2.0.4',
+            'Accept': 'image/jpeg,image/png,image/*',
+        })
         
     def ensure_cache_dir(self):
         """Ensure the cache directory exists"""
@@ -80,8 +105,14 @@ class ImageCache(QObject):
         if not url:
             return False
             
-        cache_path = self.get_cache_path(url)
-        return os.path.exists(cache_path) and os.path.getsize(cache_path) > 0
+        return self._file_size(self.get_cache_path(url)) > 0
+    
+    def _file_size(self, path):
+        """Get the size of a file with a single stat, or 0 if it doesn't exist"""
+        try:
+            return os.stat(path).st_size
+        except OSError:
+            return 0
     
     def get_pixmap(self, url, max_width=None, max_height=None):
         """
@@ -101,11 +132,17 @@ class ImageCache(QObject):
         cache_path = self.get_cache_path(url)
         
         if self.is_cached(url):
+            # Mark as recently used so eviction keeps it
+            try:
+                os.utime(cache_path)
+            except OSError:
+                pass
+            
             # Load from cache
             pixmap = QPixmap(cache_path)
             if pixmap.isNull():
                 # Cache is corrupted, redownload
-                os.remove(cache_path)
+                self._remove_cached_file(cache_path)
                 self.download_image(url)
                 return self.get_default_poster() if max_height > max_width else self.get_default_backdrop()
                 
@@ -119,8 +156,7 @@ class ImageCache(QObject):
             return pixmap
         else:
             # Not cached, start download in background
-            if url not in self._loading:
-                self.download_image(url)
+            self.download_image(url)
                 
             # Return default while loading
             return self.get_default_poster() if max_height > max_width else self.get_default_backdrop()
@@ -132,16 +168,36 @@ class ImageCache(QObject):
         Args:
             url: The URL of the image to download
         """
-        if not url or url in self._loading:
+        if not url or not self._claim(url):
             return
-            
-        self._loading[url] = True
         
         # Start a thread for the download to avoid blocking UI
         thread = threading.Thread(target=self._download_thread, args=(url,))
         thread.daemon = True
         thread.start()
     
+    def cache_image(self, url):
+        """
+        Download an image into the cache on the calling thread
+        
+        Does nothing if the image is already cached or being downloaded.
+        
+        Args:
+            url: The URL of the image to download
+        """
+        if not url or self.is_cached(url) or not self._claim(url):
+            return
+            
+        self._download_thread(url)
+    
+    def _claim(self, url):
+        """Mark a URL as being downloaded, or return False if it already is"""
+        with self._loading_lock:
+            if url in self._loading:
+                return False
+            self._loading[url] = True
+            return True
+    
     def _download_thread(self, url):
         """
         Background thread for downloading images
@@ -149,51 +205,125 @@ class ImageCache(QObject):
         Args:
             url: The URL of the image to download
         """
+        temp_path = None
         try:
             cache_path = self.get_cache_path(url)
             
             # Skip if already downloaded since starting thread
-            if os.path.exists(cache_path) and os.path.getsize(cache_path) > 0:
+            if self._file_size(cache_path) > 0:
                 logger.info(f"Image already downloaded while thread was starting: {url}")
-                del self._loading[url]
                 return
                 
             logger.info(f"Downloading image: {url}")
             
-            # Add a user agent to avoid 403 errors from some hosts
-            headers = {
-                'User-Agent': 'Mozilla/5.0 ChumpStreams/2.0.4',
-                'Accept': 'image/jpeg,image/png,image/*',
-            }
-            req = urllib.request.Request(url, headers=headers)
+            # Stream the body to a temporary file rather than holding it in
+            # memory, and only move it into place once it is complete
+            with self._session.get(url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.part')
+                with os.fdopen(fd, 'wb') as out_file:
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        out_file.write(chunk)
             
-            with urllib.request.urlopen(req, timeout=10) as response, open(cache_path, 'wb') as out_file:
-                data = response.read()
-                out_file.write(data)
-            
-            # Verify the downloaded file is a valid image
-            pixmap = QPixmap()
-            if not pixmap.load(cache_path):
+            # Verify the downloaded file is an image. QImageReader only reads
+            # the header and, unlike QPixmap, is safe to use off the GUI thread.
+            if not QImageReader(temp_path).canRead():
                 logger.warning(f"Downloaded file is not a valid image: {url}")
-                os.remove(cache_path)
-                del self._loading[url]
                 return
+            
+            # Only count the size a replaced file didn't already account for
+            replaced_size = self._file_size(cache_path)
+            os.replace(temp_path, cache_path)
+            temp_path = None
                 
             logger.info(f"Image downloaded and cached: {url}")
             
             # Emit signal that image is loaded
-            self.image_loaded.emit(url, pixmap)
+            self.image_loaded.emit(url, cache_path)
+            
+            self._track_download(os.path.getsize(cache_path) - replaced_size)
             
         except Exception as e:
             logger.error(f"Error downloading image from {url}: {str(e)}")
-            # Clean up any partial downloads
-            cache_path = self.get_cache_path(url)
-            if os.path.exists(cache_path):
-                os.remove(cache_path)
         finally:
+            # Clean up any partial downloads
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+            
             # Clean up loading state
-            if url in self._loading:
-                del self._loading[url]
+            with self._loading_lock:
+                self._loading.pop(url, None)
+    
+    def _remove_cached_file(self, path):
+        """Delete a cached image and take its size off the running total"""
+        size = self._file_size(path)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        
+        with self._size_lock:
+            if self._cache_bytes is not None:
+                self._cache_bytes = max(0, self._cache_bytes - size)
+    
+    def _track_download(self, size):
+        """Add a download to the cache size, evicting old files if over budget"""
+        with self._size_lock:
+            if self._cache_bytes is None:
+                # First download this session, measure what is already there
+                self._cache_bytes = sum(size for _, size, _ in self._list_cache_files())
+            else:
+                self._cache_bytes += size
+            
+            if self._cache_bytes > self.max_cache_bytes:
+                self._evict_least_recently_used()
+    
+    def get_cache_size(self):
+        """
+        Get the total size of the cached images
+        
+        The directory is only scanned the first time; after that the size
+        is kept up to date as images are downloaded and evicted.
+        
+        Returns:
+            int: Size of the cache in bytes
+        """
+        with self._size_lock:
+            if self._cache_bytes is None:
+                self._cache_bytes = sum(size for _, size, _ in self._list_cache_files())
+            return self._cache_bytes
+    
+    def _list_cache_files(self):
+        """List cached image files as (last used time, size, path) tuples"""
+        # scandir returns the file type with each entry, so only one stat
+        # call per file is needed for its size and modification time
+        files = []
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False) and not entry.name.endswith('.part'):
+                    stat = entry.stat(follow_symlinks=False)
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+    
+    def _evict_least_recently_used(self):
+        """Remove the least recently used images until the cache is well under budget"""
+        target = self.max_cache_bytes * 0.9  # Leave headroom so eviction isn't constant
+        files = sorted(self._list_cache_files())
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except OSError as e:
+                logger.warning(f"Could not evict cached image {path}: {str(e)}")
+        
+        self._cache_bytes = total
+        logger.info(f"Evicted {removed} images from cache, {total / (1024 * 1024):.1f} MB remaining")
     
     def get_default_poster(self):
         """Get a default poster image for when artwork is not available"""
@@ -217,12 +347,15 @@ class ImageCache(QObject):
         """Clear all cached images"""
         count = 0
         try:
-            for filename in os.listdir(self.cache_dir):
-                file_path = os.path.join(self.cache_dir, filename)
-                if os.path.isfile(file_path):
-                    os.remove(file_path)
-                    count += 1
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False):
+                        os.remove(entry.path)
+                        count += 1
                     
+            with self._size_lock:
+                self._cache_bytes = None
+            
             logger.info(f"Cleared {count} images from cache")
             return True
         except Exception as e:
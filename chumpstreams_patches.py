@@ -77,6 +77,12 @@ def enable_favorite_context_menu(content_panel):
         
     content_list = content_panel.content_list
     
+    # This gets called again after every content load, so only connect the
+    # menu once per list widget, otherwise each call adds another handler
+    if getattr(content_panel, '_favorite_menu_list', None) is content_list:
+        return
+    content_panel._favorite_menu_list = content_list
+    
     # Create context menu
     context_menu = QMenu(content_list)
     
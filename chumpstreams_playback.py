@@ -14,14 +14,12 @@ logger = logging.getLogger('chumpstreams')
 class PlaybackManager:
     """Manages content playback"""
     
-    def __init__(self, api, auth, content_manager, player, settings, use_https=True, server=""):
+    def __init__(self, api, auth, content_manager, player, settings):
         self.api = api
         self.auth = auth
         self.content_manager = content_manager
         self.player = player
         self.buffer_settings = settings
-        self.USE_HTTPS = use_https
-        self.SERVER = server
     
     def update_auth(self, auth):
         """Update authentication details"""
@@ -97,7 +95,7 @@ class PlaybackManager:
                     stream_id = item['stream_id']
                     username = self.auth.get('username', '')
                     password = self.auth.get('password', '')
-                    url = f"http{'s' if self.USE_HTTPS else ''}://{self.SERVER}/live/{username}/{password}/{stream_id}.ts"
+                    url = f"{self.api.base_url}/live/{username}/{password}/{stream_id}.ts"
                     logger.info(f"Directly constructed live URL: {url[:30]}...")
                 elif content_type == 'vod':
                     stream_id = item.get('vod_id', item.get('stream_id'))
@@ -105,7 +103,7 @@ class PlaybackManager:
                         ext = item.get('container_extension', 'mp4')
                         username = self.auth.get('username', '')
                         password = self.auth.get('password', '')
-                        url = f"http{'s' if self.USE_HTTPS else ''}://{self.SERVER}/movie/{username}/{password}/{stream_id}.{ext}"
+                        url = f"{self.api.base_url}/movie/{username}/{password}/{stream_id}.{ext}"
                         logger.info(f"Directly constructed VOD URL: {url[:30]}...")
             except Exception as e:
                 logger.error(f"Error in direct URL construction: {str(e)}")
@@ -160,7 +158,7 @@ class PlaybackManager:
                     ext = episode.get('container_extension', 'mp4')
                     username = self.auth.get('username', '')
                     password = self.auth.get('password', '')
-                    url = f"http{'s' if self.USE_HTTPS else ''}://{self.SERVER}/series/{username}/{password}/{stream_id}.{ext}"
+                    url = f"{self.api.base_url}/series/{username}/{password}/{stream_id}.{ext}"
                     logger.info(f"Directly constructed episode URL: {url[:30]}...")
             except Exception as e:
                 logger.error(f"Error in direct episode URL construction: {str(e)}")
@@ -8,6 +8,7 @@ Last updated: 2025-01-12 14:12:08
 Implements search features for ChumpStreams
 """
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PyQt5.QtCore import QObject, pyqtSignal, QRunnable, QThreadPool, pyqtSlot
 
 logger = logging.getLogger('chumpstreams')
@@ -35,23 +36,34 @@ class SearchWorker(QRunnable):
         try:
             all_results = []
             total_types = len(self.content_types)
+            results_by_type = {}
             
-            for i, content_type in enumerate(self.content_types):
-                self.signals.progress.emit(i + 1, total_types)
+            # Search all content types at once - each search is dominated by
+            # network waits, so running them together overlaps those waits
+            with ThreadPoolExecutor(max_workers=max(1, total_types)) as executor:
+                futures = {
+                    executor.submit(self.api.search, self.search_term, content_type): content_type
+                    for content_type in self.content_types
+                }
                 
-                # Use the API's search method directly
-                try:
-                    results = self.api.search(self.search_term, content_type)
+                for completed, future in enumerate(as_completed(futures), 1):
+                    content_type = futures[future]
+                    self.signals.progress.emit(completed, total_types)
                     
-                    # Add content type to each result
-                    for item in results:
-                        item['content_type'] = content_type
-                        all_results.append(item)
+                    try:
+                        results = future.result()
+                        results_by_type[content_type] = results
+                        logger.info(f"Found {len(results)} {content_type} results for '{self.search_term}'")
                         
-                    logger.info(f"Found {len(results)} {content_type} results for '{self.search_term}'")
-                    
-                except Exception as e:
-                    logger.error(f"Error searching {content_type}: {str(e)}")
+                    except Exception as e:
+                        logger.error(f"Error searching {content_type}: {str(e)}")
+            
+            # Collect results in the requested content type order
+            for content_type in self.content_types:
+                for item in results_by_type.get(content_type, []):
+                    # Add content type to each result
+                    item['content_type'] = content_type
+                    all_results.append(item)
             
             # Log total results
             logger.info(f"Total search results: {len(all_results)} for '{self.search_term}'")
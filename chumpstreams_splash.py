@@ -10,7 +10,7 @@ Splash screen shown during application startup
 import sys
 import os
 from PyQt5.QtWidgets import QSplashScreen, QProgressBar, QLabel, QVBoxLayout, QWidget, QApplication
-from PyQt5.QtCore import Qt, QTimer, QSize, QRect, QEventLoop
+from PyQt5.QtCore import Qt, QTimer, QSize, QRect, QEventLoop, pyqtSignal
 from PyQt5.QtGui import QFont, QColor, QPalette, QLinearGradient, QBrush, QPainter, QPixmap
 
 
@@ -28,6 +28,9 @@ def resource_path(relative_path):
 class ChumpStreamsSplash(QSplashScreen):
     """Splash screen for ChumpStreams application"""
     
+    # Emitted when the splash screen is hidden, either closed or clicked away
+    finished = pyqtSignal()
+    
     def __init__(self):
         """Initialize splash screen"""
         # Create a pixmap for the splash screen with a black background
@@ -149,6 +152,11 @@ class ChumpStreamsSplash(QSplashScreen):
         if overall_progress >= 100:
             self.timer.stop()
             QTimer.singleShot(500, self.close)  # Close after a short delay
+    
+    def hideEvent(self, event):
+        """Notify listeners that the splash screen is gone"""
+        super().hideEvent(event)
+        self.finished.emit()
 
 
 def show_splash_screen(app, duration_ms=10000):
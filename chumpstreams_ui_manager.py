@@ -136,6 +136,8 @@ class CategoryPanel(QWidget):
         # Create category list
         self.categories_list = QListWidget()
         self.categories_list.setAlternatingRowColors(True)
+        # All rows are one line of text, so skip measuring each row
+        self.categories_list.setUniformItemSizes(True)
         layout.addWidget(self.categories_list)
         
         # Connect signals
@@ -143,8 +145,16 @@ class CategoryPanel(QWidget):
     
     def set_categories(self, categories):
         """Set category list"""
-        self.categories_list.clear()
-        self.categories_list.addItems(categories)
+        # Rebuild the list in one go, without repainting or emitting
+        # signals for each row
+        self.categories_list.setUpdatesEnabled(False)
+        self.categories_list.blockSignals(True)
+        try:
+            self.categories_list.clear()
+            self.categories_list.addItems(categories)
+        finally:
+            self.categories_list.blockSignals(False)
+            self.categories_list.setUpdatesEnabled(True)
     
     def _on_category_clicked(self, item):
         """Handle category selection"""